@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Measure typing effort for a text corpus against one or more keymap revisions.
+
+Each character is mapped to the cheapest (layer, position) that types it:
+the lowest layer first, then without Shift. The corpus is streamed in
+chunks to worker processes, and their per-finger load, travel distance
+(from info.json geometry), same-finger bigrams and layer switches are merged.
+Each chunk starts with the fingers at home, so travel across a chunk
+boundary is approximate; bigrams and layer switches across boundaries are
+exact.
+
+Usage:
+    python3 analyze_corpus.py corpus/*.txt
+    python3 analyze_corpus.py notes.md --keymap HEAD~3:keymap/keymap.c --keymap keymap/keymap.c
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from keycodes import keycode_chars
+from keymap_arrays import git_show
+from keymap_parser import IncrementalKeymap
+
+KEYMAP_PATH = 'keymap/keymap.c'
+INFO_PATH = 'qmk_firmware/keyboards/bastardkb/charybdis/4x6/info.json'
+
+CHUNK_CHARS = 1 << 22
+
+# Finger for each of the 12 columns of the main rows
+COLUMN_FINGERS = ['LP', 'LP', 'LR', 'LM', 'LI', 'LI', 'RI', 'RI', 'RM', 'RR', 'RP', 'RP']
+THUMB_FINGERS = {48: 'LT', 49: 'LT', 50: 'LT', 51: 'RT', 52: 'RT', 53: 'LT', 54: 'LT', 55: 'RT'}
+FINGERS = ['LP', 'LR', 'LM', 'LI', 'LT', 'RT', 'RI', 'RM', 'RR', 'RP']
+HOME_POSITIONS = {'LP': 25, 'LR': 26, 'LM': 27, 'LI': 28, 'LT': 48,
+                  'RT': 51, 'RI': 31, 'RM': 32, 'RR': 33, 'RP': 34}
+SHIFT_KEYS = ('KC_LSFT', 'KC_RSFT')
+
+# What the custom keycodes in process_record_user tap, by highest layer
+# (None = any other layer). A missing layer means no character is typed.
+CUSTOM_TAPS = {
+    'KC_1_TG1': {None: 'KC_1', 2: 'KC_F1', 3: None, 4: 'KC_0'},
+    'KC_2_TG2': {None: 'KC_2', 2: 'KC_F2', 3: None, 4: 'KC_9'},
+    'KC_3_TG3': {None: 'KC_3', 2: 'KC_F3', 4: 'KC_8'},
+    'KC_4_TG4': {None: 'KC_4', 2: 'KC_F4', 4: 'KC_7'},
+    'KC_X_TG2': {None: 'KC_X', 1: 'KC_P1', 2: 'KC_PGUP', 4: 'KC_DOT'},
+    'TD(TD_Z_LAYER)': {None: 'KC_Z', 1: 'KC_P0', 2: 'KC_HOME', 4: 'KC_SLSH'},
+    'KC_Q_TG4': {None: 'KC_Q'},
+    'KC_P_TO0': {None: 'KC_P'},
+    'KC_ENT_MO4': {None: 'KC_ENT'},
+    'KC_ENT_EXIT': {None: 'KC_ENT'},
+    'KC_ENT_L2_EXIT': {None: 'KC_ENT'},
+    'KC_SPC_EXIT': {None: 'KC_SPC'},
+}
+
+
+def tapped_keycode(key_code, layer_num):
+    """Return the basic keycode a key taps on a layer, or None."""
+    if key_code in CUSTOM_TAPS:
+        taps = CUSTOM_TAPS[key_code]
+        return taps[layer_num] if layer_num in taps else taps.get(None)
+    if key_code.startswith('LT(') and ',' in key_code:
+        return key_code[key_code.index(',') + 1:-1].strip()
+    return key_code
+
+
+def key_chars(key_code, layer_num):
+    """Return [(char, needs_shift)] typed by a key on a layer."""
+    if key_code == 'KC_PLUS_COLON':
+        return [('+', False), (':', True)]
+    tapped = tapped_keycode(key_code, layer_num)
+    if tapped is None:
+        return []
+    base, shifted = keycode_chars(tapped)
+    chars = []
+    if base is not None:
+        chars.append((base, False))
+    if shifted is not None:
+        chars.append((shifted, True))
+    return chars
+
+
+def finger_for(position):
+    if position >= 48:
+        return THUMB_FINGERS[position]
+    return COLUMN_FINGERS[position % 12]
+
+
+def build_char_map(layers):
+    """
+    Map each character to (layer, position, finger, shift_position).
+
+    shift_position is the Shift key used (on the other hand when possible),
+    or -1 when no Shift is needed.
+    """
+    shift_positions = {}
+    for pos, key_code in enumerate(layers.get(0, [])):
+        if key_code in SHIFT_KEYS:
+            shift_positions.setdefault(finger_for(pos)[0], pos)
+
+    char_map = {}
+    for layer_num in sorted(layers):
+        for pos, key_code in enumerate(layers[layer_num]):
+            for char, needs_shift in key_chars(key_code, layer_num):
+                shift_pos = -1
+                if needs_shift:
+                    other_hand = 'R' if finger_for(pos)[0] == 'L' else 'L'
+                    shift_pos = shift_positions.get(other_hand, shift_positions.get(finger_for(pos)[0], -1))
+                    if shift_pos < 0:
+                        continue
+                entry = (layer_num, pos, finger_for(pos), shift_pos)
+                current = char_map.get(char)
+                # Lower layer first, then prefer no Shift
+                if current is None or (current[0], current[3] >= 0) > (layer_num, shift_pos >= 0):
+                    char_map[char] = entry
+    return char_map
+
+
+def parse_geometry(file_path):
+    """Return [(x, y)] key centers in key units, indexed by LAYOUT position."""
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    return [(k['x'] + k.get('w', 1) / 2, k['y'] + k.get('h', 1) / 2)
+            for k in data['layouts']['LAYOUT']['layout']]
+
+
+def analyze_text(text, prev, char_map, geometry):
+    """Effort statistics for one chunk; `prev` is the character before it."""
+    finger_load = Counter()
+    travel = Counter()
+    unmapped = Counter()
+    chars = sfb = layer_switches = shifts = 0
+
+    finger_pos = dict(HOME_POSITIONS)
+    last = char_map.get(prev) if prev else None
+    last_finger = last[2] if last else None
+    last_pos = last[1] if last else None
+    last_layer = last[0] if last else 0
+
+    for char in text:
+        entry = char_map.get(char)
+        if entry is None:
+            unmapped[char] += 1
+            last_finger = None
+            continue
+        layer_num, pos, finger, shift_pos = entry
+        chars += 1
+        finger_load[finger] += 1
+
+        old = finger_pos[finger]
+        if old != pos:
+            (x0, y0), (x1, y1) = geometry[old], geometry[pos]
+            travel[finger] += math.hypot(x1 - x0, y1 - y0)
+            finger_pos[finger] = pos
+
+        if shift_pos >= 0:
+            shifts += 1
+            finger_load[finger_for(shift_pos)] += 1
+        if finger == last_finger and pos != last_pos:
+            sfb += 1
+        if layer_num != last_layer:
+            layer_switches += 1
+
+        last_finger, last_pos, last_layer = finger, pos, layer_num
+
+    return {
+        'chars': chars,
+        'finger_load': finger_load,
+        'travel': travel,
+        'unmapped': unmapped,
+        'sfb': sfb,
+        'layer_switches': layer_switches,
+        'shifts': shifts,
+    }
+
+
+def merge(total, part):
+    for key, value in part.items():
+        if isinstance(value, Counter):
+            total.setdefault(key, Counter()).update(value)
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def read_chunks(paths, chunk_chars=CHUNK_CHARS):
+    """Yield (previous_char, chunk) across all corpus files."""
+    prev = ''
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            while True:
+                chunk = f.read(chunk_chars)
+                if not chunk:
+                    break
+                yield prev, chunk
+                prev = chunk[-1]
+
+
+_worker_maps = None
+
+
+def _init_worker(char_maps, geometry):
+    global _worker_maps
+    _worker_maps = (char_maps, geometry)
+
+
+def _analyze_chunk(args):
+    prev, chunk = args
+    char_maps, geometry = _worker_maps
+    return [analyze_text(chunk, prev, char_map, geometry) for char_map in char_maps]
+
+
+def analyze_corpus(paths, keymaps, geometry, workers=None, chunk_chars=CHUNK_CHARS):
+    """
+    Analyze corpus files against each {layer: [keycodes]} in `keymaps`.
+
+    At most two chunks per worker are in flight, so memory stays bounded by
+    chunk size regardless of corpus size.
+    """
+    char_maps = [build_char_map(layers) for layers in keymaps]
+    totals = [{} for _ in keymaps]
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(char_maps, geometry)) as pool:
+        pending = deque()
+        for job in read_chunks(paths, chunk_chars):
+            pending.append(pool.submit(_analyze_chunk, job))
+            if len(pending) >= workers * 2:
+                for total, part in zip(totals, pending.popleft().result()):
+                    merge(total, part)
+        while pending:
+            for total, part in zip(totals, pending.popleft().result()):
+                merge(total, part)
+    return totals
+
+
+def load_keymap_source(spec):
+    """Read 'path' from disk or 'REV:path' from git."""
+    if os.path.exists(spec) or ':' not in spec:
+        with open(spec, 'r') as f:
+            return f.read()
+    rev, path = spec.split(':', 1)
+    return git_show(rev, path)
+
+
+def print_comparison(names, totals):
+    width = max(14, *(len(n) + 2 for n in names))
+    print(f"{'':<18}" + "".join(f"{n:>{width}}" for n in names))
+    print("-" * (18 + width * len(names)))
+
+    def row(label, values):
+        print(f"{label:<18}" + "".join(f"{v:>{width}}" for v in values))
+
+    row("Characters", [t.get('chars', 0) for t in totals])
+    row("Unmapped", [sum(t.get('unmapped', Counter()).values()) for t in totals])
+    for finger in FINGERS:
+        row(f"Load {finger} %", [f"{100 * t.get('finger_load', Counter())[finger] / max(1, t.get('chars', 0)):.1f}"
+                                 for t in totals])
+    row("Travel (u)", [f"{sum(t.get('travel', Counter()).values()):.0f}" for t in totals])
+    row("Travel/char (u)", [f"{sum(t.get('travel', Counter()).values()) / max(1, t.get('chars', 0)):.3f}"
+                            for t in totals])
+    row("Same-finger %", [f"{100 * t.get('sfb', 0) / max(1, t.get('chars', 0)):.2f}" for t in totals])
+    row("Layer switch %", [f"{100 * t.get('layer_switches', 0) / max(1, t.get('chars', 0)):.2f}"
+                           for t in totals])
+    row("Shift %", [f"{100 * t.get('shifts', 0) / max(1, t.get('chars', 0)):.2f}" for t in totals])
+
+    for name, t in zip(names, totals):
+        top = t.get('unmapped', Counter()).most_common(10)
+        if top:
+            print(f"\n{name} unmapped: " + ", ".join(f"{c!r}x{n}" for c, n in top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typing-corpus effort analysis.")
+    parser.add_argument('corpus', nargs='+', help="text files to analyze")
+    parser.add_argument('--keymap', action='append', metavar='[REV:]PATH',
+                        help="keymap.c to compare (repeatable; REV:path reads from git)")
+    parser.add_argument('--info', default=INFO_PATH)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_CHARS / (1 << 20))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.info):
+        print(f"Error: info.json not found at {args.info}")
+        return
+    specs = args.keymap or [KEYMAP_PATH]
+    try:
+        keymaps = [IncrementalKeymap(load_keymap_source(spec)).layers for spec in specs]
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: {getattr(e, 'stderr', '') or e}")
+        return
+
+    totals = analyze_corpus(args.corpus, keymaps, parse_geometry(args.info), args.workers,
+                            max(1, int(args.chunk_mb * (1 << 20))))
+    print_comparison(specs, totals)
+
+
+if __name__ == "__main__":
+    main()
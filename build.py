@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Rebuild generated documentation and sources only when their inputs change.
+
+Each target lists its input files (including the scripts that produce it).
+Input content hashes from the last successful build are kept in
+.build-state.json; a target is rebuilt when an output is missing or any input
+hash differs. Hashes are cached by (mtime, size), so a no-op build does not
+read any files. Independent targets build in parallel.
+
+Usage:
+    python3 build.py                 # build all default targets
+    python3 build.py --dry-run       # explain what would be rebuilt and why
+    python3 build.py pdf convert     # named targets (convert is not a default)
+    python3 build.py --force         # rebuild everything
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+STATE_PATH = '.build-state.json'
+
+KEYMAP_PATH = 'keymap/keymap.c'
+INFO_PATH = 'qmk_firmware/keyboards/bastardkb/charybdis/4x6/info.json'
+QMK_KEYMAP_DIR = 'qmk_firmware/keyboards/bastardkb/charybdis/4x6/keymaps/dcar'
+
+
+def build_pdf(output, keymap_path, info_path):
+    from generate_layout_pdf import generate_pdf
+    generate_pdf(output, keymap_path, info_path)
+
+
+def build_color_wheel(output):
+    from generate_color_wheel import generate_color_wheel_svg
+    generate_color_wheel_svg(output)
+
+
+def build_rgb_header(output, spec_path):
+    from generate_rgb_indicators import generate_header, load_spec
+    header = generate_header(load_spec(spec_path), os.path.basename(spec_path))
+    with open(output, 'w') as f:
+        f.write(header)
+
+
+def build_ascii_layout(output, keymap_path, info_path):
+    from keymap_parser import parse_keymap
+    from pretty_print_layout import parse_info_json, print_layer
+    layers = parse_keymap(keymap_path)
+    layout_info = parse_info_json(info_path)
+    with open(output, 'w') as f, contextlib.redirect_stdout(f):
+        for idx in sorted(layers):
+            print_layer(layers[idx], layout_info, f"Layer {idx}")
+
+
+def build_keycode_sheet(output, keymap_path):
+    from keycode_table import compile_table, render_sheet
+    from keymap_parser import parse_keymap
+    with open(output, 'w') as f:
+        f.write(render_sheet(compile_table(parse_keymap(keymap_path))) + "\n")
+
+
+def build_convert():
+    from convert_layout import convert
+    convert()
+
+
+# name: inputs, outputs, action, args, default
+TARGETS = {
+    'pdf': {
+        'inputs': [KEYMAP_PATH, INFO_PATH, 'generate_layout_pdf.py', 'keymap_parser.py', 'keycodes.py'],
+        'outputs': ['charybdis_layout.pdf'],
+        'action': build_pdf,
+        'args': ('charybdis_layout.pdf', KEYMAP_PATH, INFO_PATH),
+    },
+    'color-wheel': {
+        'inputs': ['generate_color_wheel.py'],
+        'outputs': ['color_wheel.svg'],
+        'action': build_color_wheel,
+        'args': ('color_wheel.svg',),
+    },
+    'rgb-header': {
+        'inputs': ['rgb_layers.json', 'generate_rgb_indicators.py'],
+        'outputs': ['keymap/rgb_layers.h'],
+        'action': build_rgb_header,
+        'args': ('keymap/rgb_layers.h', 'rgb_layers.json'),
+    },
+    'ascii': {
+        'inputs': [KEYMAP_PATH, INFO_PATH, 'pretty_print_layout.py', 'keymap_parser.py'],
+        'outputs': ['build/layout.txt'],
+        'action': build_ascii_layout,
+        'args': ('build/layout.txt', KEYMAP_PATH, INFO_PATH),
+    },
+    'keycode-sheet': {
+        'inputs': [KEYMAP_PATH, 'keycode_table.py', 'keymap_arrays.py', 'keymap_parser.py'],
+        'outputs': ['build/keycode_sheet.txt'],
+        'action': build_keycode_sheet,
+        'args': ('build/keycode_sheet.txt', KEYMAP_PATH),
+    },
+    # Overwrites the working keymap in qmk_firmware, so only on request
+    'convert': {
+        'inputs': ['charybdis.layout.json', KEYMAP_PATH, 'convert_layout.py', 'via_ingest.py',
+                   'keycodes.py', 'keymap_parser.py'],
+        'outputs': [f'{QMK_KEYMAP_DIR}/keymap.c', f'{QMK_KEYMAP_DIR}/config.h'],
+        'action': build_convert,
+        'args': (),
+        'default': False,
+    },
+}
+
+
+class HashCache:
+    """Content hashes keyed by path, reused while (mtime, size) is unchanged."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def hash(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        cached = self.entries.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = h.hexdigest()
+        self.entries[path] = stamp + [digest]
+        return digest
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    state.setdefault('files', {})
+    state.setdefault('targets', {})
+    return state
+
+
+def save_state(state, path=STATE_PATH):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def stale_reasons(name, target, state, hashes, force=False):
+    """
+    Return (reasons, digests): why a target needs rebuilding (empty if up to
+    date) and the input hashes the decision was based on. The digests are
+    recorded after a successful build, so an input edited while the target
+    builds is seen as changed next time.
+    """
+    digests = {path: hashes.hash(path) for path in target['inputs']}
+    if force:
+        return ["forced"], digests
+    recorded = state['targets'].get(name)
+    reasons = []
+    for output in target['outputs']:
+        if not os.path.exists(output):
+            reasons.append(f"output missing: {output}")
+    if recorded is None:
+        return reasons or ["no record of a previous build"], digests
+    for path in target['inputs']:
+        digest = digests[path]
+        if digest is None:
+            reasons.append(f"input missing: {path}")
+        elif path not in recorded:
+            reasons.append(f"new input: {path}")
+        elif recorded[path] != digest:
+            reasons.append(f"input changed: {path}")
+    return reasons, digests
+
+
+def build_order(names):
+    """Group targets into waves; a target waits for targets producing its inputs."""
+    producers = {out: n for n in names for out in TARGETS[n]['outputs']}
+    deps = {n: {producers[i] for i in TARGETS[n]['inputs'] if i in producers} - {n} for n in names}
+    waves = []
+    done = set()
+    while len(done) < len(names):
+        wave = [n for n in names if n not in done and deps[n] <= done]
+        if not wave:
+            raise ValueError(f"dependency cycle among: {', '.join(sorted(set(names) - done))}")
+        waves.append(wave)
+        done.update(wave)
+    return waves
+
+
+def run_target(name):
+    target = TARGETS[name]
+    for output in target['outputs']:
+        out_dir = os.path.dirname(output)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+    with contextlib.redirect_stdout(sys.stderr):
+        target['action'](*target['args'])
+    return name
+
+
+def build(names, dry_run=False, force=False, jobs=None):
+    """Build the named targets; returns True if everything succeeded."""
+    start = time.perf_counter()
+    state = load_state()
+    hashes = HashCache(state['files'])
+    ok = True
+    built = 0
+
+    for wave in build_order(names):
+        todo = []
+        digests = {}
+        for name in wave:
+            reasons, digests[name] = stale_reasons(name, TARGETS[name], state, hashes, force)
+            missing = [p for p in TARGETS[name]['inputs'] if not os.path.exists(p)]
+            if not reasons:
+                if dry_run:
+                    print(f"{name}: up to date")
+                continue
+            print(f"{name}: rebuild ({'; '.join(reasons)})")
+            if missing:
+                print(f"{name}: Error: cannot build, missing {', '.join(missing)}")
+                ok = False
+            elif not dry_run:
+                todo.append(name)
+
+        if not todo:
+            continue
+        if len(todo) == 1:
+            results = [(todo[0], None)]
+            try:
+                run_target(todo[0])
+            except Exception as e:
+                results = [(todo[0], e)]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [(name, pool.submit(run_target, name)) for name in todo]
+                results = [(name, future.exception()) for name, future in futures]
+
+        for name, error in results:
+            if error is not None:
+                print(f"{name}: Error: {error}")
+                state['targets'].pop(name, None)
+                ok = False
+                continue
+            built += 1
+            state['targets'][name] = digests[name]
+
+    if not dry_run:
+        save_state(state)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{built} target(s) built in {elapsed:.1f} ms" if not dry_run
+          else f"dry run finished in {elapsed:.1f} ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental documentation build.")
+    parser.add_argument('targets', nargs='*', help=f"targets: {', '.join(TARGETS)}")
+    parser.add_argument('-n', '--dry-run', action='store_true', help="explain, do not build")
+    parser.add_argument('-f', '--force', action='store_true', help="rebuild even if up to date")
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = parser.parse_args()
+
+    names = args.targets or [n for n, t in TARGETS.items() if t.get('default', True)]
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        print(f"Error: unknown target(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    if not build(names, args.dry_run, args.force, args.jobs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,30 @@
-import json
-import os
+from via_ingest import ingest
+
+LAYOUT_PATH = 'charybdis.layout.json'
 
 def convert():
-    with open('charybdis.layout.json', 'r') as f:
-        data = json.load(f)
-    
-    layers = data['layers']
-    
-    custom_map = {
-        "CUSTOM(0)": "DPI_MOD", "CUSTOM(1)": "DPI_RMOD", "CUSTOM(2)": "S_D_MOD",
-        "CUSTOM(3)": "S_D_RMOD", "CUSTOM(4)": "SNIPING", "CUSTOM(5)": "SNP_TOG",
-        "CUSTOM(6)": "DRGSCRL", "CUSTOM(7)": "DRG_TOG", "RESET": "QK_BOOT",
-        "RGB_MOD": "RM_NEXT", "KC_MS_BTN1": "MS_BTN1", "KC_MS_BTN2": "MS_BTN2",
-        "KC_MS_BTN3": "MS_BTN3"
-    }
-    
-    def map_key(k):
-        return custom_map.get(k, k)
+    # Streams the export, validates every layer and maps VIA-only keycodes
+    result = ingest(LAYOUT_PATH)
+    if result.errors:
+        for error in result.errors:
+            print(f"Error: {error}")
+        return
 
     processed_layers = []
-    for layer in layers:
+    for layer in result.layers:
         new_layer = [None] * 56
         for r in range(4):
             for c in range(6):
-                new_layer[r * 12 + c] = map_key(layer[r * 6 + c])
-                new_layer[r * 12 + 6 + c] = map_key(layer[30 + r * 6 + (5 - c)])
-        new_layer[48] = map_key(layer[27])
-        new_layer[49] = map_key(layer[28])
-        new_layer[50] = map_key(layer[25])
-        new_layer[51] = map_key(layer[55])
-        new_layer[52] = map_key(layer[57])
-        new_layer[53] = map_key(layer[29])
-        new_layer[54] = map_key(layer[26])
-        new_layer[55] = map_key(layer[59])
+                new_layer[r * 12 + c] = layer[r * 6 + c]
+                new_layer[r * 12 + 6 + c] = layer[30 + r * 6 + (5 - c)]
+        new_layer[48] = layer[27]
+        new_layer[49] = layer[28]
+        new_layer[50] = layer[25]
+        new_layer[51] = layer[55]
+        new_layer[52] = layer[57]
+        new_layer[53] = layer[29]
+        new_layer[54] = layer[26]
+        new_layer[55] = layer[59]
         processed_layers.append(new_layer)
 
     processed_layers[0][53] = "KC_LALT"
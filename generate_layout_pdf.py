@@ -2,8 +2,13 @@
 """
 Generate a PDF of the Charybdis 4x6 keyboard layout.
 Requires: pip install reportlab
+
+Usage:
+    python3 generate_layout_pdf.py
+    python3 generate_layout_pdf.py --catalog team.pdf alice=path/keymap.c bob=path/keymap.c
 """
 
+import argparse
 import json
 import re
 import os
@@ -14,6 +19,9 @@ from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from keycodes import SHIFTED_SYMBOLS
+from keymap_parser import parse_keymap
+
 # Layer colors matching the RGB settings in keymap.c
 LAYER_COLORS = {
     0: (0.9, 0.9, 0.9),      # White/Light gray (Base)
@@ -107,71 +115,6 @@ KEY_LABELS = {
     'RM_NEXT': 'RGB >',
 }
 
-def parse_keymap(file_path):
-    with open(file_path, 'r') as f:
-        content = f.read()
-
-    keymaps_match = re.search(
-        r'const uint16_t PROGMEM keymaps\[\]\[MATRIX_ROWS\]\[MATRIX_COLS\] = \{(.*?)\};',
-        content, re.DOTALL
-    )
-    if not keymaps_match:
-        return {}
-
-    keymaps_str = keymaps_match.group(1)
-    layers = {}
-    search_start = 0
-
-    while True:
-        match = re.search(r'\[(\d+)\]\s*=\s*LAYOUT\(', keymaps_str[search_start:])
-        if not match:
-            break
-
-        layer_num = int(match.group(1))
-        start_index = search_start + match.end()
-
-        paren_depth = 1
-        current_index = start_index
-        layout_content = ""
-
-        while current_index < len(keymaps_str) and paren_depth > 0:
-            char = keymaps_str[current_index]
-            if char == '(':
-                paren_depth += 1
-            elif char == ')':
-                paren_depth -= 1
-            if paren_depth > 0:
-                layout_content += char
-            current_index += 1
-
-        layout_str = re.sub(r'//.*', '', layout_content)
-        layout_str = re.sub(r'/\*.*?\*/', '', layout_str, flags=re.DOTALL)
-        layout_str = " ".join(layout_str.split())
-
-        keys = []
-        current_key = ""
-        depth = 0
-        for char in layout_str:
-            if char == '(': 
-                depth += 1
-                current_key += char
-            elif char == ')':
-                depth -= 1
-                current_key += char
-            elif char == ',' and depth == 0:
-                keys.append(current_key.strip())
-                current_key = ""
-            else:
-                current_key += char
-        if current_key:
-            keys.append(current_key.strip())
-
-        layers[layer_num] = keys
-        search_start = current_index
-
-    return layers
-
-
 def parse_info_json(file_path):
     with open(file_path, 'r') as f:
         data = json.load(f)
@@ -238,14 +181,7 @@ def simplify_key(key_code, layer_num=None):
     shift_match = re.match(r'S\(KC_(\w+)\)', key_code)
     if shift_match:
         char = shift_match.group(1)
-        shift_map = {
-            '1': '!', '2': '@', '3': '#', '4': '$', '5': '%',
-            '6': '^', '7': '&', '8': '*', '9': '(', '0': ')',
-            'MINS': '_', 'EQL': '+', 'GRV': '~',
-            'LBRC': '{', 'RBRC': '}', 'BSLS': '|',
-            'SCLN': ':', 'QUOT': '"', 'COMM': '<', 'DOT': '>', 'SLSH': '?',
-        }
-        return shift_map.get(char, f'S-{char}')
+        return SHIFTED_SYMBOLS.get(char, f'S-{char}')
 
     # Handle LT(layer, key)
     lt_match = re.match(r'LT\((\d+),\s*KC_(\w+)\)', key_code)
@@ -365,15 +301,20 @@ def draw_key(c, x, y, width, height, label, bg_color):
         c.drawString(text_x, text_y, line)
 
 
-def draw_layer(c, layer_keys, layout_info, layer_num, start_x, start_y, key_size=28):
+def draw_layer(c, layer_keys, layout_info, layer_num, start_x, start_y, key_size=28,
+               layer_name=None, bg_color=None, keymap_name=None):
     """Draw a complete layer on the canvas at specified position."""
-    layer_name = LAYER_NAMES.get(layer_num, f"Layer {layer_num}")
-    bg_color = LAYER_COLORS.get(layer_num, (0.9, 0.9, 0.9))
+    if layer_name is None:
+        layer_name = LAYER_NAMES.get(layer_num, f"Layer {layer_num}")
+    if bg_color is None:
+        bg_color = LAYER_COLORS.get(layer_num, (0.9, 0.9, 0.9))
 
     # Title
     c.setFont("Helvetica-Bold", 12)
     c.setFillColor(colors.black)
     title = f"{layer_name} (L{layer_num})"
+    if keymap_name:
+        title = f"{keymap_name}: {title}"
     title_width = c.stringWidth(title, "Helvetica-Bold", 12)
     title_x = (LETTER[0] - title_width) / 2
     c.drawString(title_x, start_y, title)
@@ -442,11 +383,143 @@ def generate_pdf(output_path, keymap_path, info_path):
     c.save()
     print(f"PDF saved to: {output_path}")
 
+def parse_layer_indicators(keymap_path):
+    """
+    Read layer names and colors from a keymap's own RGB indicators.
+
+    Understands the `case N: rgb_matrix_set_color_all(r, g, b); // Color (Name)`
+    switch in rgb_matrix_indicators_user, and the generated rgb_layers.h table
+    (`[N] = {r, g, b, true}, // Name`) when the keymap includes it.
+    Returns ({layer: name}, {layer: (r, g, b)}) with colors lightened for paper.
+    """
+    with open(keymap_path, 'r') as f:
+        content = f.read()
+
+    names = {}
+    rgb = {}
+
+    header_path = os.path.join(os.path.dirname(keymap_path), 'rgb_layers.h')
+    if '"rgb_layers.h"' in content and os.path.exists(header_path):
+        with open(header_path, 'r') as f:
+            header = f.read()
+        table = re.search(r'layer_colors\[\w*\]\s*=\s*\{(.*?)\};', header, re.DOTALL)
+        if table:
+            for m in re.finditer(r'\[(\d+)\]\s*=\s*\{\s*(\d+),\s*(\d+),\s*(\d+),\s*(\w+)\s*\},'
+                                 r'\s*//\s*(.*)', table.group(1)):
+                layer = int(m.group(1))
+                names[layer] = re.sub(r'\s*\(effect colors\)', '', m.group(6)).strip()
+                if m.group(5) == 'true':
+                    rgb[layer] = tuple(int(m.group(i)) for i in (2, 3, 4))
+
+    body = re.search(r'bool rgb_matrix_indicators_user\(void\)\s*\{(.*?)\n\}', content, re.DOTALL)
+    if body:
+        for case in re.finditer(r'case (\d+):(.*?)(?=case \d+:|default:|\n\s*\}\s*\n)',
+                                body.group(1), re.DOTALL):
+            layer = int(case.group(1))
+            # The last call is the unconditional branch (e.g. mouse unlocked)
+            calls = list(re.finditer(r'rgb_matrix_set_color_all\(\s*(\d+),\s*(\d+),\s*(\d+)\s*\)'
+                                     r'[^\n]*?(?://\s*([^\n]*))?$', case.group(2), re.MULTILINE))
+            if not calls:
+                continue
+            m = calls[-1]
+            rgb.setdefault(layer, tuple(int(m.group(i)) for i in (1, 2, 3)))
+            if m.group(4):
+                label = re.search(r'\((.*?)\)', m.group(4))
+                names.setdefault(layer, (label.group(1) if label else m.group(4)).strip())
+
+    # Mix with white so the key labels stay readable
+    bg = {layer: tuple(round(0.6 + 0.4 * v / 255, 3) for v in color)
+          for layer, color in rgb.items()}
+    return {layer: name.upper() for layer, name in names.items()}, bg
+
+
+def _draw_catalog_page(c, entries, layout_info):
+    """Draw one catalog page: up to 3 (keymap name, keymap, layer) entries."""
+    margin = 0.15 * inch
+    key_size = 36
+    current_y = LETTER[1] - margin
+    for keymap_name, (layers, names, bg), layer_num in entries:
+        height_used = draw_layer(c, layers[layer_num], layout_info, layer_num,
+                                 margin, current_y, key_size=key_size,
+                                 layer_name=names.get(layer_num), bg_color=bg.get(layer_num),
+                                 keymap_name=keymap_name)
+        current_y -= height_used + 15
+
+
+def generate_catalog(output_path, keymaps, info_path):
+    """
+    Render many keymaps into one PDF, grouped layer by layer.
+
+    `keymaps` is a list of (name, keymap_path).
+    """
+    entries = []
+    max_layer = -1
+    for keymap_name, keymap_path in keymaps:
+        layers = parse_keymap(keymap_path)
+        if not layers:
+            print(f"Warning: no layers found in {keymap_path}")
+            continue
+        names, bg = parse_layer_indicators(keymap_path)
+        entries.append((keymap_name, (layers, names, bg)))
+        max_layer = max(max_layer, max(layers))
+
+    pages = []
+    for layer_num in range(max_layer + 1):
+        on_layer = [(name, keymap, layer_num) for name, keymap in entries if layer_num in keymap[0]]
+        for i in range(0, len(on_layer), 3):
+            pages.append(on_layer[i:i + 3])
+
+    if not pages:
+        print("No layers found!")
+        return
+
+    layout_info = parse_info_json(info_path)
+    c = canvas.Canvas(output_path, pagesize=LETTER, pageCompression=1)
+    for page in pages:
+        _draw_catalog_page(c, page, layout_info)
+        c.showPage()
+
+    c.save()
+    print(f"Catalog of {len(entries)} keymaps ({len(pages)} pages) saved to: {output_path}")
+
+
+def parse_catalog_entry(spec):
+    """Parse 'name=path' or 'path' (named after the keymap directory)."""
+    if '=' in spec:
+        name, path = spec.split('=', 1)
+        return name, path
+    return os.path.basename(os.path.dirname(os.path.abspath(spec))), spec
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the keyboard layout PDF.")
+    parser.add_argument('--catalog', metavar='OUTPUT',
+                        help="render several keymaps into one comparison PDF")
+    parser.add_argument('keymaps', nargs='*', metavar='[NAME=]KEYMAP_C')
+    parser.add_argument('--info', help="path to info.json")
+    args = parser.parse_args()
+
     base_path = '/home/dcar/projects/mech-keyboard'
     keymap_path = f'{base_path}/qmk_firmware/keyboards/bastardkb/charybdis/4x6/keymaps/dcar/keymap.c'
     info_path = f'{base_path}/qmk_firmware/keyboards/bastardkb/charybdis/4x6/info.json'
     output_path = f'{base_path}/charybdis_layout.pdf'
+    if args.info:
+        info_path = args.info
+
+    if args.catalog:
+        keymaps = [parse_catalog_entry(spec) for spec in args.keymaps]
+        missing = [path for _, path in keymaps if not os.path.exists(path)]
+        if not keymaps or missing:
+            print(f"Error: keymap not found at {missing[0]}" if missing else "Error: no keymaps given")
+            return
+        if not os.path.exists(info_path):
+            print(f"Error: info.json not found at {info_path}")
+            return
+        generate_catalog(args.catalog, keymaps, info_path)
+        return
+    if args.keymaps:
+        print("Error: keymap arguments are only used with --catalog")
+        return
 
     if not os.path.exists(keymap_path):
         print(f"Error: keymap not found at {keymap_path}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Generate keymap/rgb_layers.h from the declarative lighting spec in rgb_layers.json.
+
+The header holds precomputed per-layer colors and the digit -> LED table used by
+show mode, plus the dirty flag that rgb_matrix_indicators_user checks so the
+layer/lock/show-mode decisions only rerun when that state changes.
+
+Usage:
+    python3 generate_rgb_indicators.py [spec.json] [-o keymap/rgb_layers.h]
+"""
+
+import argparse
+import json
+import os
+
+SPEC_PATH = 'rgb_layers.json'
+OUTPUT_PATH = 'keymap/rgb_layers.h'
+
+MAX_LAYERS = 32
+NUM_DIGITS = 10
+
+
+def check_color(value, where):
+    if (not isinstance(value, list) or len(value) != 3
+            or not all(isinstance(c, int) and 0 <= c <= 255 for c in value)):
+        raise ValueError(f"{where}: expected [r, g, b] with values 0-255, got {value!r}")
+    return tuple(value)
+
+
+def load_spec(file_path):
+    """Load and validate the lighting spec."""
+    with open(file_path, 'r') as f:
+        spec = json.load(f)
+
+    layers = {}
+    for key, entry in spec.get('layers', {}).items():
+        if not key.isdigit() or int(key) >= MAX_LAYERS:
+            raise ValueError(f"{file_path}: layers.{key}: layer must be 0-{MAX_LAYERS - 1}")
+        where = f"{file_path}: layers.{key}"
+        layers[int(key)] = {
+            'name': entry.get('name', f"Layer {key}"),
+            'color': check_color(entry['color'], f"{where}.color") if 'color' in entry else None,
+            'locked_name': entry.get('locked_name', entry.get('name', f"Layer {key}")),
+            'locked_color': (check_color(entry['locked_color'], f"{where}.locked_color")
+                             if 'locked_color' in entry else None),
+        }
+    if not layers:
+        raise ValueError(f"{file_path}: no layers defined")
+
+    leds = spec.get('number_key_leds', [])
+    if len(leds) != NUM_DIGITS or not all(isinstance(i, int) and 0 <= i < 255 for i in leds):
+        raise ValueError(f"{file_path}: number_key_leds must list {NUM_DIGITS} LED indices "
+                         "for keys 1-9 then 0")
+
+    return {
+        'layers': layers,
+        'flashlight_color': check_color(spec.get('flashlight_color', [255, 255, 255]),
+                                        f"{file_path}: flashlight_color"),
+        'show_mode_color': check_color(spec.get('show_mode_color', [255, 255, 255]),
+                                       f"{file_path}: show_mode_color"),
+        'number_key_leds': leds,
+    }
+
+
+def format_entry(index, color, name):
+    if color is None:
+        return f"    [{index}] = {{0, 0, 0, false}}, // {name} (effect colors)"
+    r, g, b = color
+    return f"    [{index}] = {{{r}, {g}, {b}, true}}, // {name}"
+
+
+def generate_header(spec, source_name):
+    layers = spec['layers']
+    count = max(layers) + 1
+
+    lines = [
+        f"// Generated by generate_rgb_indicators.py from {source_name} - do not edit.",
+        "#pragma once",
+        "",
+        f"#define RGB_LAYER_COUNT {count}",
+        "",
+        "typedef struct {",
+        "    uint8_t r, g, b;",
+        "    bool    enabled; // false: leave the current RGB effect visible",
+        "} layer_rgb_t;",
+        "",
+        "static const layer_rgb_t layer_colors[RGB_LAYER_COUNT] = {",
+    ]
+    for i in range(count):
+        entry = layers.get(i, {'name': f"Layer {i}", 'color': None})
+        lines.append(format_entry(i, entry['color'], entry['name']))
+    lines.append("};")
+    lines.append("")
+
+    lines.append("// Used instead of layer_colors while mouse_is_locked")
+    lines.append("static const layer_rgb_t layer_locked_colors[RGB_LAYER_COUNT] = {")
+    for i in range(count):
+        entry = layers.get(i)
+        if entry and entry['locked_color']:
+            lines.append(format_entry(i, entry['locked_color'], entry['locked_name']))
+        elif entry:
+            lines.append(format_entry(i, entry['color'], entry['name']))
+        else:
+            lines.append(format_entry(i, None, f"Layer {i}"))
+    lines.append("};")
+    lines.append("")
+
+    r, g, b = spec['flashlight_color']
+    lines.append(f"static const layer_rgb_t flashlight_color = {{{r}, {g}, {b}, true}};")
+    r, g, b = spec['show_mode_color']
+    lines.append(f"static const layer_rgb_t show_mode_color = {{{r}, {g}, {b}, true}};")
+    lines.append("")
+
+    # Reorder so the table is indexed by the digit itself (key 0 is last on the row)
+    leds = spec['number_key_leds']
+    digit_leds = [leds[9]] + leds[:9]
+    lines.append("// LED of the number key for each digit 0-9, used by show mode")
+    lines.append(f"static const uint8_t digit_leds[{NUM_DIGITS}] = "
+                 f"{{{', '.join(str(i) for i in digit_leds)}}};")
+    lines.append("")
+
+    lines.extend([
+        "// Set whenever layer, lock, flashlight or show-mode state changes",
+        "static bool rgb_indicator_dirty = true;",
+        "",
+        "static inline void rgb_indicator_invalidate(void) {",
+        "    rgb_indicator_dirty = true;",
+        "}",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the RGB indicator header.")
+    parser.add_argument('spec', nargs='?', default=SPEC_PATH)
+    parser.add_argument('-o', '--output', default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.spec):
+        print(f"Error: spec not found at {args.spec}")
+        return
+
+    header = generate_header(load_spec(args.spec), os.path.basename(args.spec))
+    with open(args.output, 'w') as f:
+        f.write(header)
+    print(f"Header saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Persistent "where is this key" index over keymap.c revisions.
+
+Every keycode, and every keycode nested inside a macro such as
+LT(3, KC_SLSH) or S(KC_1), is indexed by (revision, layer, position) in a
+SQLite database. Git revisions are indexed once; the working-tree keymap is
+re-indexed layer by layer when its content hash changes.
+
+Usage:
+    python3 keycode_index.py update               # index new git revisions + working tree
+    python3 keycode_index.py KC_DEL QK_BOOT       # where are these keys
+    python3 keycode_index.py 'MS_*' --rev WORKTREE
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import subprocess
+import time
+
+from keymap_arrays import git_revisions, git_show
+from keymap_parser import IncrementalKeymap
+
+KEYMAP_PATH = 'keymap/keymap.c'
+INDEX_PATH = '.keycode_index.db'
+WORKTREE = 'WORKTREE'
+
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    rev TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    committed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    keycode TEXT NOT NULL,
+    rev TEXT NOT NULL,
+    layer INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    expr TEXT NOT NULL,
+    nested INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_keycode ON postings (keycode);
+CREATE INDEX IF NOT EXISTS postings_rev ON postings (rev, layer);
+"""
+
+
+def physical_key(position):
+    """Describe a LAYOUT position as hand, row and column (or thumb key)."""
+    if position >= 48:
+        thumbs = {48: 'left thumb 1', 49: 'left thumb 2', 50: 'left thumb 3',
+                  51: 'right thumb 1', 52: 'right thumb 2', 53: 'left thumb 4',
+                  54: 'left thumb 5', 55: 'right thumb 3'}
+        return thumbs.get(position, f'thumb {position}')
+    row, col = divmod(position, 12)
+    if col < 6:
+        return f'left r{row} c{col}'
+    return f'right r{row} c{col - 6}'
+
+
+def key_terms(expr):
+    """Return [(keycode, nested)] to index for one key expression."""
+    normalized = ''.join(expr.split())
+    terms = [(normalized, 0)]
+    if '(' in normalized:
+        inner = normalized[normalized.index('(') + 1:]
+        seen = {normalized}
+        for name in IDENTIFIER_RE.findall(inner):
+            if name not in seen:
+                seen.add(name)
+                terms.append((name, 1))
+    return terms
+
+
+def layer_rows(rev, layer_num, keys):
+    rows = []
+    for pos, expr in enumerate(keys):
+        normalized = ''.join(expr.split())
+        for keycode, nested in key_terms(expr):
+            rows.append((keycode, rev, layer_num, pos, normalized, nested))
+    return rows
+
+
+class KeycodeIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def revisions(self):
+        return {rev: h for rev, h in self.db.execute("SELECT rev, content_hash FROM revisions")}
+
+    def index_source(self, rev, text, committed=0):
+        """Index (or re-index) one revision; only changed layers are rewritten."""
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        row = self.db.execute("SELECT content_hash FROM revisions WHERE rev = ?", (rev,)).fetchone()
+        if row and row[0] == content_hash:
+            return []
+
+        layers = IncrementalKeymap(text).layers
+        old_layers = {}
+        for layer_num, pos, expr in self.db.execute(
+                "SELECT layer, position, expr FROM postings WHERE rev = ? AND nested = 0 "
+                "ORDER BY layer, position", (rev,)):
+            old_layers.setdefault(layer_num, []).append(expr)
+        new_layers = {n: [''.join(k.split()) for k in keys] for n, keys in layers.items()}
+
+        changed = [n for n in set(old_layers) | set(new_layers)
+                   if old_layers.get(n) != new_layers.get(n)]
+        with self.db:
+            for layer_num in changed:
+                self.db.execute("DELETE FROM postings WHERE rev = ? AND layer = ?", (rev, layer_num))
+                if layer_num in layers:
+                    self.db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?)",
+                                        layer_rows(rev, layer_num, layers[layer_num]))
+            self.db.execute("INSERT OR REPLACE INTO revisions VALUES (?, ?, ?)",
+                            (rev, content_hash, committed))
+        return sorted(changed)
+
+    def update(self, keymap_path=KEYMAP_PATH, git=True):
+        """Index git revisions not seen before, then the working-tree keymap."""
+        added = 0
+        if git:
+            known = self.revisions()
+            try:
+                revs = git_revisions(keymap_path)
+            except (OSError, subprocess.CalledProcessError):
+                revs = []
+            for rev in revs:
+                if rev[:12] in known:
+                    continue
+                committed = int(subprocess.run(['git', 'show', '-s', '--format=%ct', rev],
+                                               capture_output=True, text=True, check=True).stdout)
+                self.index_source(rev[:12], git_show(rev, keymap_path), committed)
+                added += 1
+        changed = []
+        if os.path.exists(keymap_path):
+            with open(keymap_path, 'r') as f:
+                changed = self.index_source(WORKTREE, f.read(), int(time.time()))
+        return added, changed
+
+    def query(self, pattern, rev=None):
+        """Rows of (keycode, rev, layer, position, expr, nested) matching a keycode or glob."""
+        if any(c in pattern for c in '*?['):
+            sql = "SELECT keycode, rev, layer, position, expr, nested FROM postings WHERE keycode GLOB ?"
+        else:
+            sql = "SELECT keycode, rev, layer, position, expr, nested FROM postings WHERE keycode = ?"
+        args = [pattern]
+        if rev:
+            sql += " AND rev = ?"
+            args.append(rev)
+        sql += " ORDER BY rev, layer, position"
+        return self.db.execute(sql, args).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find where keycodes live across layers and revisions.")
+    parser.add_argument('keycodes', nargs='+', help="keycodes or globs ('MS_*'), or 'update'")
+    parser.add_argument('--rev', help="only this revision (e.g. WORKTREE or a short hash)")
+    parser.add_argument('--keymap', default=KEYMAP_PATH)
+    parser.add_argument('--db', default=INDEX_PATH)
+    args = parser.parse_args()
+
+    index = KeycodeIndex(args.db)
+    try:
+        if args.keycodes == ['update']:
+            added, changed = index.update(args.keymap)
+            print(f"Indexed {added} new revision(s); working tree layers changed: "
+                  f"{', '.join(map(str, changed)) or 'none'}")
+            return
+
+        index.update(args.keymap, git=False)
+        for pattern in args.keycodes:
+            start = time.perf_counter()
+            rows = index.query(pattern, args.rev)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"\n{pattern}: {len(rows)} match(es) in {elapsed:.3f} ms")
+            for keycode, rev, layer, pos, expr, nested in rows:
+                via = f"  (in {expr})" if nested else ""
+                print(f"  {rev:<12} L{layer} pos {pos:<3} {physical_key(pos):<16} {keycode}{via}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Compile the parsed keymap into a dense table of effective keycodes.
+
+QMK resolves a key by walking active layers from highest to lowest, skipping
+KC_TRNS, and falling back to the default layer (0). This precomputes that walk
+for every layer_state bitmask so lookups are a single array index.
+
+Usage:
+    python3 keycode_table.py                 # "what does each key do" sheet
+    python3 keycode_table.py --all           # one column per layer_state
+    python3 keycode_table.py -o keymap.ckt   # save the compiled table
+"""
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+
+from keymap_arrays import KeymapArrays, SymbolTable
+from keymap_parser import parse_keymap
+
+KEYMAP_PATH = 'keymap/keymap.c'
+
+TRANSPARENT = {'KC_TRNS', '_______'}
+MAX_LAYERS = 16
+
+FILE_MAGIC = b'CKT1'
+
+
+class KeycodeTable:
+    """Effective keycodes indexed by (layer_state, position)."""
+
+    def __init__(self, symbols, codes, num_layers, num_positions):
+        self.symbols = symbols
+        self.codes = codes
+        self.num_layers = num_layers
+        self.num_positions = num_positions
+        self.symbol_index = {s: i for i, s in enumerate(symbols)}
+
+    @property
+    def num_states(self):
+        return 1 << self.num_layers
+
+    def code(self, layer_state, position):
+        """Return the symbol index of the effective keycode."""
+        return self.codes[(layer_state & (self.num_states - 1)) * self.num_positions + position]
+
+    def lookup(self, layer_state, position):
+        """Return the effective keycode string for a layer_state and position."""
+        return self.symbols[self.code(layer_state, position)]
+
+    def row(self, layer_state):
+        """Return the effective keycodes of every position for one layer_state."""
+        start = (layer_state & (self.num_states - 1)) * self.num_positions
+        return [self.symbols[c] for c in self.codes[start:start + self.num_positions]]
+
+    def save(self, file_path):
+        blob = '\n'.join(self.symbols).encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack('<HHI', self.num_layers, self.num_positions, len(blob)))
+            f.write(blob)
+            codes = array('H', self.codes)
+            if sys.byteorder == 'big':
+                codes.byteswap()
+            f.write(codes.tobytes())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as f:
+            if f.read(4) != FILE_MAGIC:
+                raise ValueError(f"{file_path}: not a compiled keycode table")
+            num_layers, num_positions, blob_len = struct.unpack('<HHI', f.read(8))
+            symbols = f.read(blob_len).decode('utf-8').split('\n')
+            codes = array('H')
+            codes.frombytes(f.read())
+        if sys.byteorder == 'big':
+            codes.byteswap()
+        if len(codes) != (1 << num_layers) * num_positions:
+            raise ValueError(f"{file_path}: truncated table")
+        return cls(symbols, codes, num_layers, num_positions)
+
+
+def compile_table(layers):
+    """Build a KeycodeTable from a {layer_num: [keycodes]} dict or KeymapArrays."""
+    if isinstance(layers, KeymapArrays):
+        keymap = layers
+    else:
+        keymap = KeymapArrays.from_layers(layers)
+    if not keymap.layers:
+        raise ValueError("no layers to compile")
+    num_layers = max(keymap.layers) + 1
+    if num_layers > MAX_LAYERS:
+        raise ValueError(f"{num_layers} layers exceeds the {MAX_LAYERS}-layer limit")
+    num_positions = max(len(row) for row in keymap.layers.values())
+
+    # Compact the (possibly shared, multi-revision) symbol table to this keymap
+    symbols = SymbolTable(['KC_NO'])
+    used = {}
+    for row in keymap.layers.values():
+        for c in row:
+            if c not in used:
+                key_code = keymap.symbols.symbols[c]
+                used[c] = -1 if key_code in TRANSPARENT else symbols.intern(key_code)
+    no_code = symbols.code('KC_NO')
+
+    # Per layer: symbol index, or -1 for transparent / missing keys
+    missing = array('H')
+    resolved = []
+    for layer_num in range(num_layers):
+        row = keymap.layers.get(layer_num, missing)
+        resolved.append([used[row[pos]] if pos < len(row) else -1
+                         for pos in range(num_positions)])
+
+    # Layer 0 is the default layer: its transparent keys resolve to KC_NO
+    base = [no_code if c < 0 else c for c in resolved[0]]
+
+    # Build states in increasing order so the state without its highest bit
+    # is already computed: effective(state) = top layer, else effective(rest)
+    codes = array('H', base)
+    for state in range(1, 1 << num_layers):
+        top = state.bit_length() - 1
+        rest = (state & ~(1 << top)) * num_positions
+        top_row = resolved[top]
+        for pos in range(num_positions):
+            c = top_row[pos]
+            codes.append(codes[rest + pos] if c < 0 else c)
+
+    return KeycodeTable(symbols.symbols, codes, num_layers, num_positions)
+
+
+def format_state(state, num_layers):
+    """Label a layer_state bitmask; 0 (no layer bits, default layer only) is 'default'."""
+    if state == 0:
+        return 'default'
+    return 'L' + '+'.join(str(l) for l in range(num_layers) if state & (1 << l))
+
+
+def _format_rows(header, rows):
+    """Lay out rows of cells under a header, each column as wide as its content."""
+    widths = [max(len(cell) for cell in column) for column in zip(header, *rows)]
+    lines = [(f"{'Pos':<4} | " + " ".join(f"{h:<{w}}" for h, w in zip(header, widths))).rstrip()]
+    lines.append("-" * (7 + sum(w + 1 for w in widths)))
+    for pos, cells in enumerate(rows):
+        lines.append((f"{pos:<4} | " + " ".join(f"{c:<{w}}" for c, w in zip(cells, widths))).rstrip())
+    return "\n".join(lines)
+
+
+def render_sheet(table, all_states=False):
+    """Return a text sheet of what each key does in each layer state."""
+    if all_states:
+        states = list(range(table.num_states))
+        header = [format_state(s, table.num_layers) for s in states]
+        rows = [[table.lookup(s, pos) for s in states] for pos in range(table.num_positions)]
+        return _format_rows(header, rows)
+
+    # One column per highest active layer; lower layers only matter when the
+    # top key is transparent, so list every distinct result for that column
+    header = [f"Top L{l}" for l in range(table.num_layers)]
+    rows = []
+    for pos in range(table.num_positions):
+        cells = []
+        for top in range(table.num_layers):
+            seen = []
+            for lower in range(1 << top):
+                key_code = table.lookup((1 << top) | lower, pos)
+                if key_code not in seen:
+                    seen.append(key_code)
+            cells.append(" | ".join(seen))
+        rows.append(cells)
+    return _format_rows(header, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the effective keycode table.")
+    parser.add_argument('--keymap', default=KEYMAP_PATH)
+    parser.add_argument('--all', action='store_true', help="one column per layer_state")
+    parser.add_argument('-o', '--output', help="write the compiled table to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.keymap):
+        print(f"Error: keymap not found at {args.keymap}")
+        return
+
+    table = compile_table(parse_keymap(args.keymap))
+    if args.output:
+        table.save(args.output)
+        print(f"Table saved to: {args.output} "
+              f"({table.num_states} states x {table.num_positions} keys, "
+              f"{len(table.symbols)} symbols)")
+    else:
+        print(render_sheet(table, args.all))
+
+
+if __name__ == "__main__":
+    main()
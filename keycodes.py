@@ -0,0 +1,88 @@
+"""
+Characters produced by QMK keycodes, shared by the label and analysis scripts.
+"""
+
+import string
+
+# Shifted symbol for each KC_ suffix, e.g. S(KC_1) -> '!'
+SHIFTED_SYMBOLS = {
+    '1': '!', '2': '@', '3': '#', '4': '$', '5': '%',
+    '6': '^', '7': '&', '8': '*', '9': '(', '0': ')',
+    'MINS': '_', 'EQL': '+', 'GRV': '~',
+    'LBRC': '{', 'RBRC': '}', 'BSLS': '|',
+    'SCLN': ':', 'QUOT': '"', 'COMM': '<', 'DOT': '>', 'SLSH': '?',
+}
+
+# Unshifted character for each KC_ suffix
+BASE_CHARS = {
+    'MINS': '-', 'EQL': '=', 'GRV': '`',
+    'LBRC': '[', 'RBRC': ']', 'BSLS': '\\',
+    'SCLN': ';', 'QUOT': "'", 'COMM': ',', 'DOT': '.', 'SLSH': '/',
+    'SPC': ' ', 'ENT': '\n', 'TAB': '\t',
+    'PPLS': '+', 'PMNS': '-', 'PAST': '*', 'PSLS': '/', 'PEQL': '=', 'PDOT': '.',
+}
+BASE_CHARS.update({c.upper(): c for c in string.ascii_lowercase})
+BASE_CHARS.update({d: d for d in string.digits})
+BASE_CHARS.update({f'P{d}': d for d in string.digits})
+
+# Keypad keys type the same character with or without Shift
+KEYPAD_SUFFIXES = {'PPLS', 'PMNS', 'PAST', 'PSLS', 'PEQL', 'PDOT'} | {f'P{d}' for d in string.digits}
+
+_SHIFTED_LETTERS = {c.upper(): c.upper() for c in string.ascii_lowercase}
+
+
+def keycode_chars(key_code):
+    """
+    Return (unshifted_char, shifted_char) typed by a basic keycode.
+
+    `S(KC_x)` types its shifted symbol without a separate Shift key, so it is
+    returned as the unshifted character. Either entry may be None.
+    """
+    if key_code.startswith('S(KC_') and key_code.endswith(')'):
+        suffix = key_code[5:-1]
+        return SHIFTED_SYMBOLS.get(suffix, _SHIFTED_LETTERS.get(suffix)), None
+    if not key_code.startswith('KC_'):
+        return None, None
+    suffix = key_code[3:]
+    base = BASE_CHARS.get(suffix)
+    if base is None:
+        return None, None
+    if suffix in KEYPAD_SUFFIXES:
+        return base, None
+    return base, SHIFTED_SYMBOLS.get(suffix, _SHIFTED_LETTERS.get(suffix))
+
+
+def _names(prefix, *groups):
+    return {f'{prefix}{name}' for group in groups for name in group.split()}
+
+
+# QMK keycode names (short and long aliases) accepted in keymaps and VIA exports
+QMK_KEYCODES = frozenset().union(
+    _names('KC_', ' '.join(string.ascii_uppercase), ' '.join(string.digits),
+           ' '.join(f'F{n}' for n in range(1, 25)), ' '.join(f'P{d}' for d in string.digits),
+           ' '.join(f'KP_{d}' for d in string.digits),
+           'NO TRNS TRANSPARENT ENT ENTER ESC ESCAPE BSPC BACKSPACE TAB SPC SPACE '
+           'MINS MINUS EQL EQUAL LBRC LEFT_BRACKET RBRC RIGHT_BRACKET BSLS BACKSLASH '
+           'NUHS NONUS_HASH SCLN SEMICOLON QUOT QUOTE GRV GRAVE COMM COMMA DOT SLSH SLASH '
+           'CAPS CAPS_LOCK NUBS NONUS_BACKSLASH APP APPLICATION',
+           'PSCR PRINT_SCREEN SCRL SCROLL_LOCK PAUS PAUSE BRK INS INSERT HOME PGUP PAGE_UP '
+           'DEL DELETE END PGDN PAGE_DOWN RGHT RIGHT LEFT DOWN UP NUM NUM_LOCK',
+           'PSLS PAST PMNS PPLS PENT PDOT PEQL PCMM KP_SLASH KP_ASTERISK KP_MINUS KP_PLUS '
+           'KP_ENTER KP_DOT KP_EQUAL KP_COMMA',
+           'LCTL LSFT LALT LOPT LGUI LCMD LWIN RCTL RSFT RALT ROPT ALGR RGUI RCMD RWIN '
+           'LEFT_CTRL LEFT_SHIFT LEFT_ALT LEFT_GUI RIGHT_CTRL RIGHT_SHIFT RIGHT_ALT RIGHT_GUI',
+           'MUTE VOLU VOLD MNXT MPRV MSTP MPLY MSEL EJCT MFFD MRWD BRIU BRID '
+           'AUDIO_MUTE AUDIO_VOL_UP AUDIO_VOL_DOWN MEDIA_NEXT_TRACK MEDIA_PREV_TRACK '
+           'MEDIA_STOP MEDIA_PLAY_PAUSE PWR SLEP WAKE CALC MAIL MYCM WSCH WHOM WBAK WFWD '
+           'WSTP WREF WFAV CPNL ASST MCTL LPAD',
+           'EXLM AT HASH DLR PERC CIRC AMPR ASTR LPRN RPRN UNDS PLUS LCBR RCBR PIPE '
+           'COLN DQUO DQT TILD LABK LT RABK GT QUES'),
+    _names('MS_', 'UP DOWN LEFT RGHT WHLU WHLD WHLL WHLR ACL0 ACL1 ACL2',
+           ' '.join(f'BTN{n}' for n in range(1, 9))),
+    _names('RM_', 'ON OFF TOGG NEXT PREV HUEU HUED SATU SATD VALU VALD SPDU SPDD'),
+    _names('QK_', 'BOOT BOOTLOADER REBOOT RBT DEBUG_TOGGLE CLEAR_EEPROM MAKE LOCK LEAD LEADER '
+           'REP REPEAT_KEY AREP ALT_REPEAT_KEY GESC GRAVE_ESCAPE CAPS_WORD_TOGGLE'),
+    # Short aliases of QK_ keycodes that have no QK_ prefix
+    {'DB_TOGG', 'EE_CLR', 'CW_TOGG'},
+    {'XXXXXXX', '_______'},
+)
@@ -1,4 +1,5 @@
 #include QMK_KEYBOARD_H
+#include "rgb_layers.h"
 
 // Tap Dance Definitions
 typedef struct {
@@ -80,10 +81,6 @@ static uint8_t show_mode_current_digit = 0;
 static uint16_t show_mode_timer = 0;
 static uint8_t show_mode_phase = 0; // 0=off, 1=on
 
-// LED indices for number keys 1-0 (may need adjustment for your board)
-// These are typically the matrix positions for the number row
-static const uint8_t number_key_leds[] = {36, 37, 44, 45, 49, 20, 16, 15, 8, 7};
-
 void start_show_mode(void) {
     uint8_t mode = rgb_matrix_get_mode();
     show_mode_digit_count = 0;
@@ -98,6 +95,7 @@ void start_show_mode(void) {
     show_mode_phase = 1; // Start with flash on
     show_mode_timer = timer_read();
     show_mode_active = true;
+    rgb_indicator_invalidate();
 }
 
 void z_finished(tap_dance_state_t *state, void *user_data) {
@@ -118,7 +116,6 @@ void z_finished(tap_dance_state_t *state, void *user_data) {
             } else {
                 layer_move(3);
             }
-            rgb_matrix_indicators_user();
             break;
         case DOUBLE_TAP: 
             if (!is_flashlight) {
@@ -134,6 +131,7 @@ void z_finished(tap_dance_state_t *state, void *user_data) {
                 rgb_matrix_sethsv_noeeprom(saved_rgb_h, saved_rgb_s, saved_rgb_v);
                 is_flashlight = false;
             }
+            rgb_indicator_invalidate();
             break;
     }
 }
@@ -229,7 +227,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
         case KC_EXIT:
             if (record->event.pressed) {
                 layer_move(0);
-                rgb_matrix_indicators_user();
             }
         case KC_TURBO:
             if (record->event.pressed) {
@@ -304,7 +301,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                     tap_code(KC_ENT);
                 } else {
                     layer_off(4);
-                    rgb_matrix_indicators_user();
                 }
             }
             return false;
@@ -312,7 +308,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
             if (record->event.pressed) {
                 layer_state_to_restore = layer_state;
                 layer_state_set(0); // Clear all layers (peek at base)
-                rgb_matrix_indicators_user();
                 ent_mo_timer = timer_read();
             } else {
                 if (timer_elapsed(ent_mo_timer) < MY_TAPPING_TERM) {
@@ -322,14 +317,12 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                     // Hold = Momentary Peek. Restore the full layer state.
                     layer_state_set(layer_state_to_restore);
                 }
-                rgb_matrix_indicators_user();
             }
             return false;
         case KC_SPC_EXIT:
             if (record->event.pressed) {
                 layer_state_to_restore = layer_state;
                 layer_state_set(0); 
-                rgb_matrix_indicators_user();
                 ent_mo_timer = timer_read();
             } else {
                 if (timer_elapsed(ent_mo_timer) < MY_TAPPING_TERM) {
@@ -337,14 +330,12 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                 } else {
                     layer_state_set(layer_state_to_restore);
                 }
-                rgb_matrix_indicators_user();
             }
             return false;
         case KC_BSPC_EXIT:
             if (record->event.pressed) {
                 layer_state_to_restore = layer_state;
                 layer_state_set(0); 
-                rgb_matrix_indicators_user();
                 ent_mo_timer = timer_read();
             } else {
                 if (timer_elapsed(ent_mo_timer) < MY_TAPPING_TERM) {
@@ -352,7 +343,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                 } else {
                     layer_state_set(layer_state_to_restore);
                 }
-                rgb_matrix_indicators_user();
             }
             return false;
         case KC_L_TG1:
@@ -362,7 +352,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                 } else {
                     layer_invert(1);
                 }
-                rgb_matrix_indicators_user();
             }
             return false;
         case KC_R_TG2:
@@ -372,7 +361,6 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
                 } else {
                     layer_invert(2);
                 }
-                rgb_matrix_indicators_user();
             }
             return false;
         case KC_Q_TG4:
@@ -460,6 +448,7 @@ bool process_record_user(uint16_t keycode, keyrecord_t *record) {
         case KC_MOUSE_LOCK:
             if (record->event.pressed) {
                 mouse_is_locked = !mouse_is_locked;
+                rgb_indicator_invalidate();
                 if (mouse_is_locked) {
                     layer_on(3);
                 } else {
@@ -587,34 +576,49 @@ const uint16_t PROGMEM keymaps[][MATRIX_ROWS][MATRIX_COLS] = {
     [4] = LAYOUT(KC_MINS, KC_1_TG1, KC_2_TG2, KC_3_TG3, KC_4_TG4, KC_6, KC_6, KC_7, KC_8, KC_9, KC_0, KC_MINS, KC_BSLS, KC_P_TO0, KC_O, KC_I, KC_U, KC_Y, KC_Y, KC_U, KC_I, KC_O, KC_P, KC_BSLS, KC_QUOT, KC_SCLN, KC_L, KC_K, KC_J, KC_H, KC_H, KC_J, KC_K, KC_L, KC_SCLN, KC_QUOT, KC_RSFT, LT(3, KC_SLSH), KC_DOT, KC_COMM, KC_M, KC_N, KC_N, KC_M, KC_COMM, KC_DOT, LT(3,KC_SLSH), KC_RSFT, KC_SPC, KC_ENT_EXIT, KC_L_TG1, KC_R_TG2, KC_ENT_EXIT, KC_LALT, KC_BSPC, KC_BSPC),
 };
 
-bool rgb_matrix_indicators_user(void) {
+// Indicator colors resolved from rgb_layers.h, refreshed only when dirty
+static layer_rgb_t indicator_color;
+static uint8_t indicator_flash_led = NO_LED;
+
+layer_state_t layer_state_set_user(layer_state_t state) {
+    rgb_indicator_invalidate();
+    return state;
+}
+
+static void rgb_indicator_refresh(void) {
     if (is_flashlight) {
-        rgb_matrix_set_color_all(255, 255, 255);
-        return false;
-    }
-    uint8_t layer = get_highest_layer(layer_state);
-    switch (layer) {
-        case 4: rgb_matrix_set_color_all(0, 255, 255); break; // Teal (One-Hand)
-        case 3:
-            if (mouse_is_locked) {
-                rgb_matrix_set_color_all(255, 0, 255); // Pink (Mouse Locked)
-            } else {
-                rgb_matrix_set_color_all(255, 255, 0); // Yellow (Mouse Active)
-            }
-            break;
-        case 2: rgb_matrix_set_color_all(0, 255, 0); break; // Green (Function)
-        case 1: rgb_matrix_set_color_all(0, 0, 255); break; // Blue (Symbols)
-        default: break;
+        indicator_color = flashlight_color;
+    } else {
+        uint8_t layer = get_highest_layer(layer_state);
+        if (layer >= RGB_LAYER_COUNT) {
+            indicator_color = layer_colors[0];
+        } else if (mouse_is_locked) {
+            indicator_color = layer_locked_colors[layer];
+        } else {
+            indicator_color = layer_colors[layer];
+        }
     }
 
     // Flash number key to show current RGB mode
-    if (show_mode_active && show_mode_phase == 1) {
-        uint8_t digit = show_mode_digits[show_mode_current_digit];
-        // digit 1-9 maps to index 0-8, digit 0 maps to index 9
-        uint8_t led_index = (digit == 0) ? number_key_leds[9] : number_key_leds[digit - 1];
-        rgb_matrix_set_color(led_index, 255, 255, 255); // White flash
+    if (!is_flashlight && show_mode_active && show_mode_phase == 1) {
+        indicator_flash_led = digit_leds[show_mode_digits[show_mode_current_digit]];
+    } else {
+        indicator_flash_led = NO_LED;
     }
+    rgb_indicator_dirty = false;
+}
 
+bool rgb_matrix_indicators_user(void) {
+    if (rgb_indicator_dirty) {
+        rgb_indicator_refresh();
+    }
+    // The effect repaints every frame, so the cached color is reapplied each time
+    if (indicator_color.enabled) {
+        rgb_matrix_set_color_all(indicator_color.r, indicator_color.g, indicator_color.b);
+    }
+    if (indicator_flash_led != NO_LED) {
+        rgb_matrix_set_color(indicator_flash_led, show_mode_color.r, show_mode_color.g, show_mode_color.b);
+    }
     return false;
 }
 
@@ -655,6 +659,7 @@ void matrix_scan_user(void) {
             // Flash was on, turn off
             show_mode_phase = 0;
             show_mode_timer = timer_read();
+            rgb_indicator_invalidate();
         } else {
             // Flash was off, move to next digit or end
             show_mode_current_digit++;
@@ -663,6 +668,7 @@ void matrix_scan_user(void) {
             } else {
                 show_mode_phase = 1;
                 show_mode_timer = timer_read();
+                rgb_indicator_invalidate();
             }
         }
     }
@@ -679,17 +685,14 @@ void matrix_scan_user(void) {
             layer_move(2);
         }
         x_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (pgup_held && !pgup_triggered && timer_elapsed(pgup_tap_timer) > MY_TAPPING_TERM) {
         layer_move(0);
         pgup_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (home_held && !home_triggered && timer_elapsed(home_tap_timer) > MY_TAPPING_TERM) {
         layer_move(0);
         home_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (q_held && !q_triggered && timer_elapsed(q_tap_timer) > MY_TAPPING_TERM) {
         if (get_highest_layer(layer_state) == 4) {
@@ -698,17 +701,14 @@ void matrix_scan_user(void) {
             layer_move(4);
         }
         q_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (p_held && !p_triggered && timer_elapsed(p_tap_timer) > MY_TAPPING_TERM) {
         layer_move(0);
         p_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (ent_mo_held && !ent_mo_triggered && timer_elapsed(ent_mo_timer) > MY_TAPPING_TERM) {
         layer_on(4);
         ent_mo_triggered = true;
-        rgb_matrix_indicators_user();
     }
 
     if (k1_held && !k1_triggered && timer_elapsed(k1_tap_timer) > MY_TAPPING_TERM) {
@@ -718,7 +718,6 @@ void matrix_scan_user(void) {
             layer_move(0);
         }
         k1_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (k2_held && !k2_triggered && timer_elapsed(k2_tap_timer) > MY_TAPPING_TERM) {
         if (get_highest_layer(layer_state) == 0) {
@@ -727,7 +726,6 @@ void matrix_scan_user(void) {
             layer_move(0);
         }
         k2_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (k3_held && !k3_triggered && timer_elapsed(k3_tap_timer) > MY_TAPPING_TERM) {
         if (get_highest_layer(layer_state) == 0) {
@@ -736,7 +734,6 @@ void matrix_scan_user(void) {
             layer_move(0);
         }
         k3_triggered = true;
-        rgb_matrix_indicators_user();
     }
     if (k4_held && !k4_triggered && timer_elapsed(k4_tap_timer) > MY_TAPPING_TERM) {
         if (get_highest_layer(layer_state) == 0) {
@@ -745,6 +742,5 @@ void matrix_scan_user(void) {
             layer_move(0);
         }
         k4_triggered = true;
-        rgb_matrix_indicators_user();
     }
 }
@@ -0,0 +1,39 @@
+// Generated by generate_rgb_indicators.py from rgb_layers.json - do not edit.
+#pragma once
+
+#define RGB_LAYER_COUNT 5
+
+typedef struct {
+    uint8_t r, g, b;
+    bool    enabled; // false: leave the current RGB effect visible
+} layer_rgb_t;
+
+static const layer_rgb_t layer_colors[RGB_LAYER_COUNT] = {
+    [0] = {0, 0, 0, false}, // Base (effect colors)
+    [1] = {0, 0, 255, true}, // Symbols
+    [2] = {0, 255, 0, true}, // Function
+    [3] = {255, 255, 0, true}, // Mouse Active
+    [4] = {0, 255, 255, true}, // One-Hand
+};
+
+// Used instead of layer_colors while mouse_is_locked
+static const layer_rgb_t layer_locked_colors[RGB_LAYER_COUNT] = {
+    [0] = {0, 0, 0, false}, // Base (effect colors)
+    [1] = {0, 0, 255, true}, // Symbols
+    [2] = {0, 255, 0, true}, // Function
+    [3] = {255, 0, 255, true}, // Mouse Locked
+    [4] = {0, 255, 255, true}, // One-Hand
+};
+
+static const layer_rgb_t flashlight_color = {255, 255, 255, true};
+static const layer_rgb_t show_mode_color = {255, 255, 255, true};
+
+// LED of the number key for each digit 0-9, used by show mode
+static const uint8_t digit_leds[10] = {7, 36, 37, 44, 45, 49, 20, 16, 15, 8};
+
+// Set whenever layer, lock, flashlight or show-mode state changes
+static bool rgb_indicator_dirty = true;
+
+static inline void rgb_indicator_invalidate(void) {
+    rgb_indicator_dirty = true;
+}
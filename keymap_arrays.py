@@ -0,0 +1,211 @@
+"""
+Compact in-memory keymaps: keycodes interned into a shared symbol table and
+each layer stored as an array('H') of symbol indices, like the firmware's
+uint16_t keymaps array.
+
+Keymaps built against the same SymbolTable can be compared, diffed and
+remapped with array operations instead of per-string work, and hundreds of
+revisions cost ~2 bytes per key plus one copy of each distinct keycode.
+
+Usage:
+    python3 keymap_arrays.py                  # diff keymap/keymap.c against HEAD
+    python3 keymap_arrays.py HEAD~5 HEAD      # diff two git revisions
+"""
+
+import argparse
+import subprocess
+import sys
+from array import array
+from collections import Counter
+
+from keymap_parser import IncrementalKeymap
+
+KEYMAP_PATH = 'keymap/keymap.c'
+
+MAX_SYMBOLS = 0xFFFF
+
+
+class SymbolTable:
+    """Interns keycode strings to uint16 indices."""
+
+    def __init__(self, symbols=()):
+        self.symbols = []
+        self.index = {}
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def intern(self, symbol):
+        idx = self.index.get(symbol)
+        if idx is None:
+            idx = len(self.symbols)
+            if idx >= MAX_SYMBOLS:
+                raise OverflowError(f"more than {MAX_SYMBOLS} distinct keycodes")
+            self.index[symbol] = idx
+            self.symbols.append(symbol)
+        return idx
+
+    def code(self, symbol):
+        """Return the index of an already interned symbol (KeyError if unknown)."""
+        return self.index[symbol]
+
+    def encode(self, keys):
+        intern = self.intern
+        return array('H', [intern(k) for k in keys])
+
+    def decode(self, codes):
+        symbols = self.symbols
+        return [symbols[c] for c in codes]
+
+
+class KeymapArrays:
+    """One keymap revision as {layer_num: array('H')} over a shared SymbolTable."""
+
+    __slots__ = ('symbols', 'layers', 'name')
+
+    def __init__(self, symbols, layers, name=None):
+        self.symbols = symbols
+        self.layers = layers
+        self.name = name
+
+    @classmethod
+    def from_layers(cls, layers, symbols=None, name=None):
+        """Build from a {layer_num: [keycodes]} dict as returned by parse_keymap."""
+        symbols = symbols if symbols is not None else SymbolTable()
+        return cls(symbols, {n: symbols.encode(keys) for n, keys in layers.items()}, name)
+
+    @classmethod
+    def from_source(cls, text, symbols=None, name=None):
+        return cls.from_layers(IncrementalKeymap(text).layers, symbols, name)
+
+    @classmethod
+    def from_file(cls, file_path, symbols=None):
+        with open(file_path, 'r') as f:
+            return cls.from_source(f.read(), symbols, name=file_path)
+
+    def to_layers(self):
+        """Return the {layer_num: [keycodes]} dict form."""
+        return {n: self.symbols.decode(row) for n, row in self.layers.items()}
+
+    def keycode(self, layer_num, position):
+        return self.symbols.symbols[self.layers[layer_num][position]]
+
+    def __eq__(self, other):
+        if not isinstance(other, KeymapArrays):
+            return NotImplemented
+        if self.symbols is other.symbols:
+            return self.layers == other.layers
+        return self.to_layers() == other.to_layers()
+
+    def changed_layers(self, other):
+        """Layer numbers whose contents differ (array compare, no decoding)."""
+        self._check_shared(other)
+        return sorted(n for n in set(self.layers) | set(other.layers)
+                      if self.layers.get(n) != other.layers.get(n))
+
+    def diff(self, other):
+        """Return [(layer, position, old_keycode, new_keycode)] from self to other."""
+        self._check_shared(other)
+        symbols = self.symbols.symbols
+        missing = array('H')
+        changes = []
+        for n in self.changed_layers(other):
+            old = self.layers.get(n, missing)
+            new = other.layers.get(n, missing)
+            for pos in range(max(len(old), len(new))):
+                a = old[pos] if pos < len(old) else None
+                b = new[pos] if pos < len(new) else None
+                if a != b:
+                    changes.append((n, pos,
+                                    symbols[a] if a is not None else None,
+                                    symbols[b] if b is not None else None))
+        return changes
+
+    def remap(self, mapping):
+        """Return a copy with keycodes replaced according to {old: new}."""
+        lut = array('H', range(len(self.symbols)))
+        for old, new in mapping.items():
+            if old in self.symbols:
+                lut[self.symbols.code(old)] = self.symbols.intern(new)
+        lookup = lut.__getitem__
+        return KeymapArrays(self.symbols,
+                            {n: array('H', map(lookup, row)) for n, row in self.layers.items()},
+                            self.name)
+
+    def counts(self, layer_num=None):
+        """Counter of symbol index -> occurrences, for one layer or all."""
+        rows = [self.layers[layer_num]] if layer_num is not None else self.layers.values()
+        counter = Counter()
+        for row in rows:
+            counter.update(row)
+        return counter
+
+    def frequencies(self, layer_num=None):
+        """Counter of keycode -> occurrences."""
+        symbols = self.symbols.symbols
+        return Counter({symbols[c]: n for c, n in self.counts(layer_num).items()})
+
+    def nbytes(self):
+        return sum(row.itemsize * len(row) for row in self.layers.values())
+
+    def _check_shared(self, other):
+        if self.symbols is not other.symbols:
+            raise ValueError("keymaps must share a SymbolTable to be compared by code")
+
+
+def git_show(rev, path=KEYMAP_PATH):
+    """Return the contents of a file at a git revision."""
+    return subprocess.run(['git', 'show', f'{rev}:{path}'], capture_output=True,
+                          text=True, check=True).stdout
+
+
+def git_revisions(path=KEYMAP_PATH, limit=None):
+    """Return commit hashes that touched a file, newest first."""
+    cmd = ['git', 'log', '--format=%H']
+    if limit:
+        cmd.append(f'-n{limit}')
+    cmd += ['--', path]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.split()
+
+
+def load_revisions(revs, path=KEYMAP_PATH, symbols=None):
+    """Load many git revisions of a keymap over one shared SymbolTable."""
+    symbols = symbols if symbols is not None else SymbolTable()
+    return [KeymapArrays.from_source(git_show(rev, path), symbols, name=rev) for rev in revs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff keymap revisions.")
+    parser.add_argument('old', nargs='?', default='HEAD', help="git revision")
+    parser.add_argument('new', nargs='?', help="git revision (default: working tree)")
+    parser.add_argument('--keymap', default=KEYMAP_PATH)
+    args = parser.parse_args()
+
+    symbols = SymbolTable()
+    try:
+        old = KeymapArrays.from_source(git_show(args.old, args.keymap), symbols, args.old)
+        if args.new:
+            new = KeymapArrays.from_source(git_show(args.new, args.keymap), symbols, args.new)
+        else:
+            new = KeymapArrays.from_file(args.keymap, symbols)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: {e.stderr.strip()}")
+        sys.exit(1)
+
+    changes = old.diff(new)
+    if not changes:
+        print("No keymap changes.")
+        return
+    print(f"{'Layer':<5} | {'Pos':<4} | {'Old':<20} | {'New':<20}")
+    print("-" * 58)
+    for layer, pos, a, b in changes:
+        print(f"{layer:<5} | {pos:<4} | {a or '-':<20} | {b or '-':<20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Shared parser for keymap.c and config.h.
+
+parse_keymap() returns {layer_num: [keycodes]} for the `keymaps` array.
+IncrementalKeymap keeps an index of where each `[N] = LAYOUT(...)` block and
+the custom_keycodes enum live in the source, so an editor can apply an edit
+and re-tokenize only the block it touched.
+"""
+
+import re
+
+KEYMAPS_HEADER = 'const uint16_t PROGMEM keymaps[][MATRIX_ROWS][MATRIX_COLS] = {'
+KEYMAPS_RE = re.compile(re.escape(KEYMAPS_HEADER) + r'(.*?)\};', re.DOTALL)
+LAYER_START_RE = re.compile(r'\[(\d+)\]\s*=\s*LAYOUT\(')
+ENUM_RE = re.compile(r'enum custom_keycodes\s*\{(.*?)\}', re.DOTALL)
+LINE_COMMENT_RE = re.compile(r'//.*')
+BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+# Text that can change how the surrounding source is tokenized
+STRUCTURAL_TOKENS = ('/*', '*/', '//', '"', "'")
+# Text whose appearance or removal near an edit can move a declaration match
+HEADER_TOKENS = ('keymaps', 'enum', '};')
+
+
+def split_keys(layout_content):
+    """Split the inside of LAYOUT(...) into keycodes, respecting nested parens."""
+    layout_str = LINE_COMMENT_RE.sub('', layout_content)
+    layout_str = BLOCK_COMMENT_RE.sub('', layout_str)
+    layout_str = " ".join(layout_str.split())
+
+    keys = []
+    current_key = ""
+    depth = 0
+    for char in layout_str:
+        if char == '(':
+            depth += 1
+            current_key += char
+        elif char == ')':
+            depth -= 1
+            current_key += char
+        elif char == ',' and depth == 0:
+            keys.append(current_key.strip())
+            current_key = ""
+        else:
+            current_key += char
+    if current_key:
+        keys.append(current_key.strip())
+    return keys
+
+
+def split_enum(enum_content):
+    """Return the member names of an enum body, without initializers."""
+    body = LINE_COMMENT_RE.sub('', enum_content)
+    body = BLOCK_COMMENT_RE.sub('', body)
+    names = []
+    for member in body.split(','):
+        name = member.split('=', 1)[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+def find_closing_paren(text, start, end):
+    """Return the index of the ')' closing a paren opened just before `start`, or -1."""
+    depth = 1
+    for i in range(start, end):
+        char = text[i]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+class LayerBlock:
+    """One `[N] = LAYOUT(...)` block; start/end bound the text inside the parens."""
+
+    __slots__ = ('layer_num', 'start', 'end', 'keys')
+
+    def __init__(self, layer_num, start, end, keys):
+        self.layer_num = layer_num
+        self.start = start
+        self.end = end
+        self.keys = keys
+
+
+class IncrementalKeymap:
+    """Parsed keymap.c with a span index for cheap reparsing after edits."""
+
+    def __init__(self, text):
+        self.text = text
+        self.full_reparses = 0
+        self._parse_all()
+
+    @classmethod
+    def from_file(cls, file_path):
+        with open(file_path, 'r') as f:
+            return cls(f.read())
+
+    @property
+    def layers(self):
+        return {block.layer_num: block.keys for block in self.blocks}
+
+    def _parse_all(self):
+        self.full_reparses += 1
+        text = self.text
+        self.blocks = []
+        self.keymaps_span = None
+        self.enum_span = None
+        # Whole-declaration spans, including the headers matched by the regexes
+        self.keymaps_decl = None
+        self.enum_decl = None
+        self.custom_keycodes = []
+
+        enum_match = ENUM_RE.search(text)
+        if enum_match:
+            self.enum_span = enum_match.span(1)
+            self.enum_decl = enum_match.span()
+            self.custom_keycodes = split_enum(enum_match.group(1))
+
+        keymaps_match = KEYMAPS_RE.search(text)
+        if not keymaps_match:
+            return
+        start, end = keymaps_match.span(1)
+        self.keymaps_span = (start, end)
+        self.keymaps_decl = keymaps_match.span()
+
+        pos = start
+        while True:
+            match = LAYER_START_RE.search(text, pos, end)
+            if not match:
+                break
+            content_start = match.end()
+            close = find_closing_paren(text, content_start, end)
+            content_end = close if close >= 0 else end
+            self.blocks.append(LayerBlock(int(match.group(1)), content_start, content_end,
+                                          split_keys(text[content_start:content_end])))
+            pos = content_end + 1
+
+    def _shift(self, after, delta):
+        """Move every offset past `after` by `delta`."""
+        for block in self.blocks:
+            if block.start > after:
+                block.start += delta
+                block.end += delta
+        for name in ('keymaps_span', 'keymaps_decl', 'enum_span', 'enum_decl'):
+            span = getattr(self, name)
+            if span is None:
+                continue
+            start, end = span
+            setattr(self, name, (start + delta if start > after else start,
+                                 end + delta if end > after else end))
+
+    def apply_edit(self, start, end, new_text):
+        """
+        Replace text[start:end] with new_text and update the parse.
+
+        Edits inside one LAYOUT block or the custom_keycodes enum re-tokenize
+        only that region; anything that could change the structure (comment or
+        quote markers, edits spanning block boundaries) falls back to a full parse.
+        Returns the layer number that changed, 'enum', None for an edit outside
+        both, or 'all' after a full reparse.
+        """
+        old_text = self.text[start:end]
+        reach = len(KEYMAPS_HEADER)
+        old_window = self.text[max(0, start - reach):end + reach]
+        self.text = self.text[:start] + new_text + self.text[end:]
+        delta = len(new_text) - (end - start)
+
+        if any(tok in old_text or tok in new_text for tok in STRUCTURAL_TOKENS):
+            self._parse_all()
+            return 'all'
+
+        braces = any(tok in old_text or tok in new_text for tok in '{};')
+        for block in self.blocks:
+            if block.start <= start and end <= block.end and not braces:
+                new_end = block.end + delta
+                close = find_closing_paren(self.text, block.start, new_end + 1)
+                if close != new_end:
+                    # Parens no longer balance inside the block
+                    self._parse_all()
+                    return 'all'
+                block.keys = split_keys(self.text[block.start:new_end])
+                self._shift(start, delta)
+                block.end = new_end
+                return block.layer_num
+
+        if self.enum_span and self.enum_span[0] <= start and end <= self.enum_span[1]:
+            if braces:
+                self._parse_all()
+                return 'all'
+            body_start, body_end = self.enum_span
+            self._shift(start, delta)
+            self.enum_span = (body_start, body_end + delta)
+            self.enum_decl = (self.enum_decl[0], body_end + delta + 1)
+            self.custom_keycodes = split_enum(self.text[self.enum_span[0]:self.enum_span[1]])
+            return 'enum'
+
+        # Outside the keymaps array and enum entirely: only offsets move, unless
+        # a declaration is missing (the edit may complete it) or the edit and
+        # its neighbours could form a new header or terminator
+        if self.keymaps_decl is None or self.enum_decl is None:
+            self._parse_all()
+            return 'all'
+        outside = all(end < span[0] or start > span[1]
+                      for span in (self.keymaps_decl, self.enum_decl))
+        new_window = self.text[max(0, start - reach):start + len(new_text) + reach]
+        if outside and not braces and not any(tok in old_window or tok in new_window
+                                              for tok in HEADER_TOKENS):
+            self._shift(start, delta)
+            return None
+
+        self._parse_all()
+        return 'all'
+
+
+def parse_keymap(file_path):
+    """Return {layer_num: [keycodes]} for the keymaps array in a keymap.c."""
+    return IncrementalKeymap.from_file(file_path).layers
+
+
+def parse_config_defines(file_path):
+    """Return the integer #defines from config.h as a dict."""
+    defines = {}
+    with open(file_path, 'r') as f:
+        for line in f:
+            match = re.match(r'\s*#define\s+(\w+)\s+(-?\d+)\b', line)
+            if match:
+                defines[match.group(1)] = int(match.group(2))
+    return defines
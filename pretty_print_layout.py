@@ -1,80 +1,8 @@
 import json
-import re
 import sys
 import os
 
-def parse_keymap(file_path):
-    with open(file_path, 'r') as f:
-        content = f.read()
-
-    # Extract the keymaps array
-    keymaps_match = re.search(r'const uint16_t PROGMEM keymaps\[\]\[MATRIX_ROWS\]\[MATRIX_COLS\] = \{(.*?)\};', content, re.DOTALL)
-    if not keymaps_match:
-        print("Could not find keymaps array.")
-        return {}
-
-    keymaps_str = keymaps_match.group(1)
-    
-    layers = {}
-    
-    # Iterate through the string to find "LAYOUT(" and balance parens
-    search_start = 0
-    while True:
-        # Find start of a layer definition, e.g., [0] = LAYOUT(
-        match = re.search(r'\[(\d+)\]\s*=\s*LAYOUT\(', keymaps_str[search_start:])
-        if not match:
-            break
-        
-        layer_num = int(match.group(1))
-        start_index = search_start + match.end()
-        
-        # Find the matching closing parenthesis for LAYOUT
-        paren_depth = 1
-        current_index = start_index
-        layout_content = ""
-        
-        while current_index < len(keymaps_str) and paren_depth > 0:
-            char = keymaps_str[current_index]
-            if char == '(':
-                paren_depth += 1
-            elif char == ')':
-                paren_depth -= 1
-            
-            if paren_depth > 0:
-                layout_content += char
-            
-            current_index += 1
-            
-        # Clean up the layout string
-        # Remove comments (C style)
-        layout_str = re.sub(r'//.*', '', layout_content)
-        layout_str = re.sub(r'/\*.*?\*/', '', layout_str, flags=re.DOTALL)
-        # Remove newlines and extra spaces
-        layout_str = " ".join(layout_str.split())
-        
-        # Split by comma, respecting parentheses
-        keys = []
-        current_key = ""
-        depth = 0
-        for char in layout_str:
-            if char == '(':
-                depth += 1
-                current_key += char
-            elif char == ')':
-                depth -= 1
-                current_key += char
-            elif char == ',' and depth == 0:
-                keys.append(current_key.strip())
-                current_key = ""
-            else:
-                current_key += char
-        if current_key:
-            keys.append(current_key.strip())
-        
-        layers[layer_num] = keys
-        search_start = current_index
-
-    return layers
+from keymap_parser import parse_keymap
 
 def parse_info_json(file_path):
     with open(file_path, 'r') as f:
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Replay recorded trackball motion and keystrokes through the auto-mouse layer
+logic from keymap.c and measure how often Layer 3 turns on and off.
+
+Trace format (one event per line, whitespace or comma separated, '#' comments):
+    <t_ms> m <dx> <dy>     trackball motion report (e.g. PMW3360 deltas)
+    <t_ms> k <position>    key press at LAYOUT position 0-55
+
+By default the timeout is read from matrix_scan_user in keymap.c and there is
+no debounce, as in the firmware; --from-config simulates AUTO_MOUSE_TIME and
+AUTO_MOUSE_DEBOUNCE from config.h instead (QMK's built-in auto-mouse, which
+this keymap does not use).
+
+Usage:
+    python3 simulate_auto_mouse.py trace.txt
+    python3 simulate_auto_mouse.py trace.txt --sweep 300:1000:50 --debounce 0:40:10
+"""
+
+import argparse
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from keymap_parser import parse_config_defines, parse_keymap
+
+KEYMAP_PATH = 'keymap/keymap.c'
+CONFIG_PATH = 'keymap/config.h'
+
+MOUSE_LAYER = 3
+DEFAULT_TIMEOUT = 650
+
+TIMEOUT_RE = re.compile(r'timer_elapsed\(auto_mouse_timer\)\s*>\s*(\d+)')
+
+# Layer 3 keycodes that mean "I meant to use the mouse"
+MOUSE_KEYCODES = {
+    'SNIPING', 'SNP_TOG', 'DRGSCRL', 'DRG_TOG', 'DPI_MOD', 'DPI_RMOD',
+    'S_D_MOD', 'S_D_RMOD', 'KC_TURBO', 'KC_SCR_MODE', 'KC_MOUSE_LOCK',
+}
+
+EVENT_MOTION = 0
+EVENT_KEY = 1
+
+
+def is_mouse_keycode(key_code):
+    return (key_code in MOUSE_KEYCODES
+            or key_code.startswith('MS_')
+            or key_code.startswith('KC_MS_'))
+
+
+def mouse_positions(layers):
+    """
+    Split the mouse layer into mouse-intent, lock and transparent positions.
+
+    KC_TRNS keys fall through to the base layer, so pressing them is typing,
+    not a misfire.
+    """
+    mouse_layer = layers.get(MOUSE_LAYER, [])
+    intent = set()
+    lock = set()
+    transparent = set()
+    for pos, key_code in enumerate(mouse_layer):
+        if is_mouse_keycode(key_code):
+            intent.add(pos)
+        if key_code == 'KC_MOUSE_LOCK':
+            lock.add(pos)
+        if key_code in ('KC_TRNS', '_______'):
+            transparent.add(pos)
+    return frozenset(intent), frozenset(lock), frozenset(transparent)
+
+
+def parse_firmware_timeout(file_path):
+    """Return the auto-mouse timeout hardcoded in matrix_scan_user, or None."""
+    with open(file_path, 'r') as f:
+        match = TIMEOUT_RE.search(f.read())
+    return int(match.group(1)) if match else None
+
+
+def load_trace(file_path):
+    """Load a trace into parallel arrays sorted by time."""
+    rows = []
+    with open(file_path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].replace(',', ' ').split()
+            if not line:
+                continue
+            try:
+                t = int(float(line[0]))
+                if line[1] == 'm':
+                    rows.append((t, EVENT_MOTION, int(line[2]), int(line[3])))
+                elif line[1] == 'k':
+                    rows.append((t, EVENT_KEY, int(line[2]), 0))
+                else:
+                    raise ValueError(f"unknown event type {line[1]!r}")
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"{file_path}:{line_no}: {e}") from None
+    rows.sort(key=lambda row: row[0])
+
+    times, kinds, a, b = array('q'), array('b'), array('l'), array('l')
+    for t, kind, x, y in rows:
+        times.append(t)
+        kinds.append(kind)
+        a.append(x)
+        b.append(y)
+    return times, kinds, a, b
+
+
+def simulate(trace, intent_positions, lock_positions, timeout, debounce,
+             burst_gap=50, typing_window=500, transparent_positions=frozenset()):
+    """
+    Run the auto-mouse state machine over a trace.
+
+    Motion must be sustained for `debounce` ms (reports no more than
+    `burst_gap` ms apart) before Layer 3 turns on; with debounce 0 this is the
+    behaviour of pointing_device_task_user. The layer turns off `timeout` ms
+    after the last motion report unless the mouse is locked.
+
+    As in keymap.c, unlocking turns Layer 3 off but leaves auto_mouse_on set,
+    so motion does not turn the layer back on until `timeout` ms pass without
+    motion.
+    """
+    times, kinds, xs, ys = trace
+
+    auto_on = False
+    layer_on = False
+    locked = False
+    on_since = 0
+    last_motion = 0
+    burst_start = None
+    last_burst_report = 0
+    last_typing = None
+    had_intent = False
+    after_typing = False
+
+    stats = {
+        'activations': 0,
+        'spurious': 0,
+        'spurious_while_typing': 0,
+        'misfired_keys': 0,
+        'layer_ms': 0,
+        'wrong_layer_ms': 0,
+    }
+
+    def deactivate(t):
+        duration = t - on_since
+        stats['layer_ms'] += duration
+        if not had_intent:
+            stats['spurious'] += 1
+            stats['wrong_layer_ms'] += duration
+            if after_typing:
+                stats['spurious_while_typing'] += 1
+
+    for i in range(len(times)):
+        t = times[i]
+
+        if auto_on and not locked and t - last_motion > timeout:
+            if layer_on:
+                deactivate(last_motion + timeout)
+                layer_on = False
+            auto_on = False
+
+        if kinds[i] == EVENT_MOTION:
+            if xs[i] == 0 and ys[i] == 0:
+                continue
+            if burst_start is None or t - last_burst_report > burst_gap:
+                burst_start = t
+            last_burst_report = t
+
+            if not auto_on and t - burst_start >= debounce:
+                auto_on = True
+                layer_on = True
+                on_since = t
+                had_intent = False
+                after_typing = last_typing is not None and t - last_typing <= typing_window
+                stats['activations'] += 1
+            if auto_on:
+                last_motion = t
+            continue
+
+        pos = xs[i]
+        if not layer_on:
+            last_typing = t
+            continue
+        if pos in lock_positions:
+            had_intent = True
+            locked = not locked
+            if not locked:
+                deactivate(t)
+                layer_on = False
+        elif pos in intent_positions:
+            had_intent = True
+        elif pos in transparent_positions:
+            last_typing = t
+        else:
+            stats['misfired_keys'] += 1
+            last_typing = t
+
+    if layer_on:
+        deactivate(min(times[-1], last_motion + timeout) if not locked else times[-1])
+
+    duration_ms = (times[-1] - times[0]) if len(times) else 0
+    stats['duration_ms'] = duration_ms
+    stats['churn_per_min'] = stats['activations'] * 60000 / duration_ms if duration_ms else 0.0
+    return stats
+
+
+# Worker state for sweeps, loaded once per process
+_worker_args = None
+
+
+def _init_worker(trace_path, intent_positions, lock_positions, burst_gap, typing_window,
+                 transparent_positions):
+    global _worker_args
+    _worker_args = (load_trace(trace_path), intent_positions, lock_positions,
+                    burst_gap, typing_window, transparent_positions)
+
+
+def _run_point(point):
+    trace, intent, lock, burst_gap, typing_window, transparent = _worker_args
+    timeout, debounce = point
+    stats = simulate(trace, intent, lock, timeout, debounce, burst_gap, typing_window, transparent)
+    return timeout, debounce, stats
+
+
+def sweep(trace_path, intent_positions, lock_positions, timeouts, debounces,
+          burst_gap=50, typing_window=500, workers=None, transparent_positions=frozenset()):
+    """Simulate every (timeout, debounce) pair in parallel worker processes."""
+    points = [(t, d) for t in timeouts for d in debounces]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(trace_path, intent_positions, lock_positions,
+                                       burst_gap, typing_window, transparent_positions)) as pool:
+        return list(pool.map(_run_point, points, chunksize=max(1, len(points) // 64)))
+
+
+def parse_range(spec):
+    """Parse 'N' or 'start:stop:step' (inclusive) into a list of ints."""
+    parts = [int(p) for p in spec.split(':')]
+    if len(parts) == 1:
+        return parts
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    return list(range(start, stop + 1, step))
+
+
+def print_results(results):
+    print(f"{'Timeout':>7} {'Deb':>4} | {'On':>6} {'/min':>6} {'Spur':>6} {'Typing':>6} "
+          f"{'Misfire':>7} | {'Layer s':>8} {'Wrong s':>8}")
+    print("-" * 76)
+    for timeout, debounce, s in results:
+        print(f"{timeout:>7} {debounce:>4} | {s['activations']:>6} {s['churn_per_min']:>6.1f} "
+              f"{s['spurious']:>6} {s['spurious_while_typing']:>6} {s['misfired_keys']:>7} | "
+              f"{s['layer_ms'] / 1000:>8.1f} {s['wrong_layer_ms'] / 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate auto-mouse layer churn.")
+    parser.add_argument('trace', help="recorded motion/key trace")
+    parser.add_argument('--keymap', default=KEYMAP_PATH)
+    parser.add_argument('--config', default=CONFIG_PATH)
+    parser.add_argument('--sweep', metavar='START:STOP:STEP',
+                        help="timeouts to sweep (default: the timeout in keymap.c)")
+    parser.add_argument('--debounce', metavar='START:STOP:STEP',
+                        help="debounce values to sweep (default: 0, as in keymap.c)")
+    parser.add_argument('--from-config', action='store_true',
+                        help="default to AUTO_MOUSE_TIME/AUTO_MOUSE_DEBOUNCE from config.h")
+    parser.add_argument('--burst-gap', type=int, default=50,
+                        help="max ms between reports of one motion burst")
+    parser.add_argument('--typing-window', type=int, default=500,
+                        help="ms after a keystroke that counts as typing")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.keymap):
+        print(f"Error: keymap not found at {args.keymap}")
+        return
+    if args.from_config:
+        defines = parse_config_defines(args.config) if os.path.exists(args.config) else {}
+        default_timeout = defines.get('AUTO_MOUSE_TIME', DEFAULT_TIMEOUT)
+        default_debounce = defines.get('AUTO_MOUSE_DEBOUNCE', 0)
+        print(f"Note: simulating config.h values (AUTO_MOUSE_TIME={default_timeout}, "
+              f"AUTO_MOUSE_DEBOUNCE={default_debounce}); the custom auto-mouse in keymap.c ignores them")
+    else:
+        default_timeout = parse_firmware_timeout(args.keymap) or DEFAULT_TIMEOUT
+        default_debounce = 0
+    timeouts = parse_range(args.sweep) if args.sweep else [default_timeout]
+    debounces = parse_range(args.debounce) if args.debounce else [default_debounce]
+
+    intent, lock, transparent = mouse_positions(parse_keymap(args.keymap))
+    if not intent:
+        print(f"Error: no mouse keys found on layer {MOUSE_LAYER}")
+        return
+
+    if len(timeouts) * len(debounces) == 1:
+        trace = load_trace(args.trace)
+        results = [(timeouts[0], debounces[0],
+                    simulate(trace, intent, lock, timeouts[0], debounces[0],
+                             args.burst_gap, args.typing_window, transparent))]
+    else:
+        results = sweep(args.trace, intent, lock, timeouts, debounces,
+                        args.burst_gap, args.typing_window, args.workers, transparent)
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
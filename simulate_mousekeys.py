@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Simulate QMK mousekey acceleration for the mouse layer keys and report the
+cursor trajectory and HID report stream.
+
+Models the default (non-kinetic) QMK mousekey algorithm with the MOUSEKEY_*
+settings from config.h, plus the custom KC_MS_FAST_* and KC_MS_DIAG_* keys
+from process_record_user. TIME_TO_MAX counts reports, not milliseconds.
+
+Sequence file format (one held key per line, '#' comments):
+    <press_ms> <release_ms> <KEYCODE>
+
+Usage:
+    python3 simulate_mousekeys.py --distance 500 1000 2000
+    python3 simulate_mousekeys.py --sequence keys.txt --reports
+    python3 simulate_mousekeys.py --sweep interval=8:32:8 max_speed=8:16:2 --distance 1000
+"""
+
+import argparse
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from keymap_parser import parse_config_defines
+
+CONFIG_PATH = 'keymap/config.h'
+
+# QMK defaults for settings config.h does not override
+MOUSEKEY_MOVE_DELTA = 8
+MOUSEKEY_MOVE_MAX = 127
+
+MousekeyParams = namedtuple('MousekeyParams', 'delay interval max_speed time_to_max')
+
+DIRECTIONS = {
+    'MS_UP': (0, -1),
+    'MS_DOWN': (0, 1),
+    'MS_LEFT': (-1, 0),
+    'MS_RGHT': (1, 0),
+}
+
+# Custom keycodes from process_record_user: (directions registered, tapped accel)
+CUSTOM_KEYS = {
+    'KC_MS_FAST_UP': (('MS_UP',), 2),
+    'KC_MS_FAST_DOWN': (('MS_DOWN',), 2),
+    'KC_MS_FAST_LEFT': (('MS_LEFT',), 2),
+    'KC_MS_FAST_RIGHT': (('MS_RGHT',), 2),
+    'KC_MS_DIAG_UL': (('MS_UP', 'MS_LEFT'), None),
+    'KC_MS_DIAG_UR': (('MS_UP', 'MS_RGHT'), None),
+    'KC_MS_DIAG_DL': (('MS_DOWN', 'MS_LEFT'), None),
+    'KC_MS_DIAG_DR': (('MS_DOWN', 'MS_RGHT'), None),
+}
+
+ACCEL_KEYS = {'MS_ACL0': 0, 'MS_ACL1': 1, 'MS_ACL2': 2}
+
+SWEEP_KEYS = ('MS_UP', 'KC_MS_DIAG_UR', 'KC_MS_FAST_UP')
+
+
+def load_params(file_path=CONFIG_PATH):
+    """
+    Read MOUSEKEY_* settings from config.h, using QMK defaults for the rest
+    (the non-kinetic defaults in quantum/mousekey.h: 10/20/10/30).
+    """
+    defines = parse_config_defines(file_path) if os.path.exists(file_path) else {}
+    return MousekeyParams(
+        delay=defines.get('MOUSEKEY_DELAY', 10),
+        interval=defines.get('MOUSEKEY_INTERVAL', 20),
+        max_speed=defines.get('MOUSEKEY_MAX_SPEED', 10),
+        time_to_max=defines.get('MOUSEKEY_TIME_TO_MAX', 30),
+    )
+
+
+def first_repeat_delay(delay):
+    """QMK stores mk_delay = MOUSEKEY_DELAY / 10 and waits mk_delay * 10 ms."""
+    return delay // 10 * 10
+
+
+def times_inv_sqrt2(x):
+    return (x * 181) >> 8
+
+
+class Mousekeys:
+    """State of the QMK mousekey task between 1 ms scans."""
+
+    def __init__(self, params):
+        self.params = params
+        self.x = 0
+        self.y = 0
+        self.accel = 0
+        self.repeat = 0
+        self.last_timer = 0
+        self.reports = []
+
+    def move_unit(self):
+        p = self.params
+        if self.accel & 1:
+            unit = MOUSEKEY_MOVE_DELTA * p.max_speed // 4
+        elif self.accel & 2:
+            unit = MOUSEKEY_MOVE_DELTA * p.max_speed // 2
+        elif self.accel & 4:
+            unit = MOUSEKEY_MOVE_DELTA * p.max_speed
+        elif self.repeat == 0:
+            unit = MOUSEKEY_MOVE_DELTA
+        elif self.repeat >= p.time_to_max:
+            unit = MOUSEKEY_MOVE_DELTA * p.max_speed
+        else:
+            unit = MOUSEKEY_MOVE_DELTA * p.max_speed * self.repeat // p.time_to_max
+        return min(unit, MOUSEKEY_MOVE_MAX) or 1
+
+    def send(self, t, x, y):
+        if x or y:
+            self.last_timer = t
+        self.reports.append((t, x, y))
+
+    def on(self, t, code):
+        if code in ACCEL_KEYS:
+            self.accel |= 1 << ACCEL_KEYS[code]
+            return
+        dx, dy = DIRECTIONS[code]
+        if dx:
+            self.x = self.move_unit() * dx
+        if dy:
+            self.y = self.move_unit() * dy
+        self.send(t, self.x, self.y)
+
+    def off(self, t, code):
+        if code in ACCEL_KEYS:
+            self.accel &= ~(1 << ACCEL_KEYS[code])
+            return
+        dx, dy = DIRECTIONS[code]
+        if dx and (self.x > 0) == (dx > 0):
+            self.x = 0
+        if dy and (self.y > 0) == (dy > 0):
+            self.y = 0
+        if self.x == 0 and self.y == 0:
+            self.repeat = 0
+        self.send(t, self.x, self.y)
+
+    def task(self, t):
+        if not (self.x or self.y):
+            return
+        wait = self.params.interval if self.repeat else first_repeat_delay(self.params.delay)
+        if t - self.last_timer <= wait:
+            return
+        if self.repeat < 255:
+            self.repeat += 1
+        unit = self.move_unit()
+        x = unit * (1 if self.x > 0 else -1) if self.x else 0
+        y = unit * (1 if self.y > 0 else -1) if self.y else 0
+        if x and y:
+            x = times_inv_sqrt2(x) or 1
+            y = times_inv_sqrt2(y) or 1
+        self.send(t, x, y)
+
+
+def expand_key(key_code, fast_accel):
+    """Return (press actions, release actions) as lists of ('on'|'off', code)."""
+    if key_code in DIRECTIONS or key_code in ACCEL_KEYS:
+        return [('on', key_code)], [('off', key_code)]
+    if key_code not in CUSTOM_KEYS:
+        raise ValueError(f"unsupported mousekey {key_code!r}")
+    codes, accel = CUSTOM_KEYS[key_code]
+    press = [('on', c) for c in codes]
+    release = [('off', c) for c in codes]
+    if accel is not None:
+        acl = f'MS_ACL{accel}'
+        if fast_accel == 'tap':
+            # process_record_user taps MS_ACL2: on and off before the move starts
+            press = [('on', acl), ('off', acl)] + press
+            release = release + [('on', 'MS_ACL0'), ('off', 'MS_ACL0')]
+        else:
+            press = [('on', acl)] + press
+            release = release + [('off', acl)]
+    return press, release
+
+
+def simulate_sequence(params, sequence, fast_accel='tap', until=None, stop=None):
+    """
+    Run held-key (press_ms, release_ms, keycode) tuples through the mousekey task.
+
+    Returns the list of HID reports as (t_ms, dx, dy). `stop(x, y)` may end the
+    run early once the accumulated cursor position satisfies it.
+    """
+    actions = {}
+    for press, release, key_code in sequence:
+        on_actions, off_actions = expand_key(key_code, fast_accel)
+        actions.setdefault(press, []).extend(on_actions)
+        actions.setdefault(release, []).extend(off_actions)
+
+    end = until if until is not None else max(actions, default=0)
+    mk = Mousekeys(params)
+    px = py = 0
+    seen = 0
+    for t in range(end + 1):
+        for kind, code in actions.get(t, ()):
+            getattr(mk, kind)(t, code)
+        mk.task(t)
+        if stop is not None:
+            for _, dx, dy in mk.reports[seen:]:
+                px += dx
+                py += dy
+            seen = len(mk.reports)
+            if stop(px, py):
+                break
+    return mk.reports
+
+
+def summarize(reports):
+    """Cursor distance, duration and report rate of a report stream."""
+    moving = [(t, dx, dy) for t, dx, dy in reports if dx or dy]
+    x = sum(dx for _, dx, _ in moving)
+    y = sum(dy for _, _, dy in moving)
+    duration = moving[-1][0] - moving[0][0] if len(moving) > 1 else 0
+    return {
+        'reports': len(reports),
+        'moving_reports': len(moving),
+        'x': x,
+        'y': y,
+        'distance': math.hypot(x, y),
+        'duration_ms': duration,
+        'report_hz': (len(moving) - 1) * 1000 / duration if duration else 0.0,
+    }
+
+
+def time_to_distance(params, key_code, distance, fast_accel='tap', limit_ms=30000):
+    """Milliseconds of holding key_code until the cursor has moved `distance` counts."""
+    target = distance * distance
+    reports = simulate_sequence(params, [(0, limit_ms, key_code)], fast_accel,
+                                until=limit_ms, stop=lambda x, y: x * x + y * y >= target)
+    last = reports[-1][0] if reports else None
+    stats = summarize(reports)
+    if stats['distance'] < distance:
+        return None, stats
+    return last, stats
+
+
+def _sweep_point(args):
+    params, distances, fast_accel = args
+    row = {}
+    for key_code in SWEEP_KEYS:
+        for distance in distances:
+            t, stats = time_to_distance(params, key_code, distance, fast_accel)
+            row[(key_code, distance)] = (t, stats['report_hz'])
+    return params, row
+
+
+def sweep(grid, distances, fast_accel='tap', workers=None):
+    """Evaluate every MousekeyParams in `grid` in parallel worker processes."""
+    jobs = [(params, distances, fast_accel) for params in grid]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_sweep_point, jobs, chunksize=max(1, len(jobs) // 64)))
+
+
+def parse_sweep(specs, base):
+    """Turn ['interval=8:32:8', ...] into a list of MousekeyParams."""
+    axes = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in MousekeyParams._fields:
+            raise ValueError(f"unknown parameter {name!r}; use one of {', '.join(MousekeyParams._fields)}")
+        parts = [int(v) for v in values.split(':')]
+        if len(parts) == 1:
+            axes[name] = parts
+        else:
+            step = parts[2] if len(parts) > 2 else 1
+            axes[name] = list(range(parts[0], parts[1] + 1, step))
+    names = list(axes)
+    return [base._replace(**dict(zip(names, combo))) for combo in product(*(axes[n] for n in names))]
+
+
+def load_sequence(file_path):
+    sequence = []
+    with open(file_path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            if len(fields) != 3:
+                raise ValueError(f"{file_path}:{line_no}: expected '<press_ms> <release_ms> <KEYCODE>'")
+            sequence.append((int(fields[0]), int(fields[1]), fields[2]))
+    return sequence
+
+
+def format_ms(t):
+    return f"{t}" if t is not None else "never"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate mousekey acceleration.")
+    parser.add_argument('--config', default=CONFIG_PATH)
+    parser.add_argument('--distance', type=int, nargs='+', default=[500, 1000, 2000],
+                        help="target cursor distances in HID counts")
+    parser.add_argument('--sequence', help="file of held keys to replay")
+    parser.add_argument('--reports', action='store_true', help="print every HID report")
+    parser.add_argument('--sweep', nargs='+', metavar='PARAM=START:STOP:STEP',
+                        help="sweep delay/interval/max_speed/time_to_max")
+    parser.add_argument('--fast-accel', choices=('tap', 'hold'), default='tap',
+                        help="how KC_MS_FAST_* applies MS_ACL2 (keymap taps it)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    params = load_params(args.config)
+    print(f"delay={params.delay} interval={params.interval} "
+          f"max_speed={params.max_speed} time_to_max={params.time_to_max}")
+
+    if args.sequence:
+        reports = simulate_sequence(params, load_sequence(args.sequence), args.fast_accel)
+        if args.reports:
+            for t, dx, dy in reports:
+                print(f"{t:>7} {dx:>5} {dy:>5}")
+        s = summarize(reports)
+        print(f"{s['reports']} reports ({s['moving_reports']} moving), "
+              f"cursor ({s['x']}, {s['y']}), {s['duration_ms']} ms, {s['report_hz']:.1f} Hz")
+        return
+
+    if args.sweep:
+        results = sweep(parse_sweep(args.sweep, params), args.distance, args.fast_accel, args.workers)
+        header = " ".join(f"{k[:13]}@{d}" for k in SWEEP_KEYS for d in args.distance)
+        print(f"{'Dly':>4} {'Int':>4} {'Max':>4} {'TTM':>4} {'Hz':>6} | {header}")
+        print("-" * (27 + len(header)))
+        for p, row in results:
+            hz = row[(SWEEP_KEYS[0], args.distance[0])][1]
+            cells = " ".join(f"{format_ms(row[(k, d)][0]):>{len(k[:13]) + len(str(d)) + 1}}"
+                             for k in SWEEP_KEYS for d in args.distance)
+            print(f"{p.delay:>4} {p.interval:>4} {p.max_speed:>4} {p.time_to_max:>4} {hz:>6.1f} | {cells}")
+        return
+
+    print(f"{'Key':<18} {'Distance':>8} {'Time ms':>8} {'Reports':>8} {'Rate Hz':>8}")
+    print("-" * 54)
+    for key_code in list(DIRECTIONS)[:1] + list(CUSTOM_KEYS):
+        for distance in args.distance:
+            t, s = time_to_distance(params, key_code, distance, args.fast_accel)
+            print(f"{key_code:<18} {distance:>8} {format_ms(t):>8} {s['moving_reports']:>8} "
+                  f"{s['report_hz']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Differential test for IncrementalKeymap.apply_edit.
+
+Random edits are applied to keymap/keymap.c, half of them next to the
+`keymaps`, `enum` and `};` tokens, and after every edit the incremental
+parse must match a fresh IncrementalKeymap of the same text.
+
+Usage:
+    python3 -m pytest -q test_keymap_parser.py
+    python3 test_keymap_parser.py [iterations]
+"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+from keymap_parser import IncrementalKeymap
+
+KEYMAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keymap', 'keymap.c')
+ALPHABET = 'skeymanu(),;{}[]_ \n0123456789KC_'
+HOT_RE = re.compile(r'keymaps|enum|\};')
+
+
+def random_edit(rng, text):
+    hot = [m.start() for m in HOT_RE.finditer(text)]
+    if hot and rng.random() < 0.5:
+        start = max(0, min(len(text), rng.choice(hot) + rng.randint(-3, 8)))
+    else:
+        start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.choice((0, 0, 1, 1, 2, 5)))
+    if rng.random() < 0.3:
+        # Retype what a recent deletion removed
+        return start, start, rng.choice(('s', 'e', 'keymaps', 'enum', '};', '}', ';'))
+    length = rng.choice((0, 1, 1, 2, 4))
+    return start, end, ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def assert_matches_full_parse(keymap):
+    fresh = IncrementalKeymap(keymap.text)
+    assert keymap.layers == fresh.layers, "layers differ from a full parse"
+    assert keymap.custom_keycodes == fresh.custom_keycodes, "enum differs from a full parse"
+
+
+def run_edits(seed, iterations):
+    rng = random.Random(seed)
+    with open(KEYMAP_PATH, 'r') as f:
+        keymap = IncrementalKeymap(f.read())
+    for _ in range(iterations):
+        keymap.apply_edit(*random_edit(rng, keymap.text))
+        assert_matches_full_parse(keymap)
+
+
+class IncrementalKeymapTest(unittest.TestCase):
+    def test_random_edits_match_full_parse(self):
+        for seed in range(4):
+            run_edits(seed, 500)
+
+    def test_delete_and_retype_keymaps(self):
+        with open(KEYMAP_PATH, 'r') as f:
+            keymap = IncrementalKeymap(f.read())
+        # (context, offset of the character to delete within it)
+        for word, offset in (('PROGMEM keymaps', 14), ('enum custom_keycodes', 0)):
+            pos = keymap.text.index(word) + offset
+            removed = keymap.text[pos]
+            self.assertEqual(keymap.apply_edit(pos, pos + 1, ''), 'all')
+            keymap.apply_edit(pos, pos, removed)
+            assert_matches_full_parse(keymap)
+        self.assertEqual(len(keymap.layers), len(IncrementalKeymap(keymap.text).layers))
+        self.assertTrue(keymap.custom_keycodes)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for seed in range(4):
+        run_edits(seed, iterations)
+    print(f"{4 * iterations} edits matched a full parse")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Keycode vocabulary checks for via_ingest.
+
+Usage:
+    python3 -m pytest -q test_via_ingest.py
+"""
+
+import os
+import unittest
+
+from via_ingest import check_keycode, keycode_vocabulary, map_keycode
+
+KEYMAP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keymap', 'keymap.c')
+
+
+class KeycodeVocabularyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.vocabulary = keycode_vocabulary(KEYMAP_PATH)
+
+    def test_real_names_accepted(self):
+        for key_code in ('KC_A', 'KC_SLSH', 'QK_BOOT', 'QK_CLEAR_EEPROM', 'EE_CLR',
+                         'QK_DEBUG_TOGGLE', 'DB_TOGG', 'QK_CAPS_WORD_TOGGLE', 'CW_TOGG',
+                         'KC_1_TG1', 'LT(3,KC_SLSH)', 'C(S(KC_V))'):
+            self.assertIsNone(check_keycode(key_code, self.vocabulary), key_code)
+
+    def test_fake_names_rejected(self):
+        for key_code in ('KC_FOO', 'KC_SLHS', 'QK_DB_TOGG', 'QK_EE_CLR', 'QK_CW_TOGG',
+                         'LT(3,KC_SLHS)'):
+            self.assertIsNotNone(check_keycode(key_code, self.vocabulary), key_code)
+
+    def test_legacy_mouse_names_map_both_forms(self):
+        expected = {
+            'KC_MS_BTN1': 'MS_BTN1', 'KC_BTN1': 'MS_BTN1', 'KC_BTN5': 'MS_BTN5',
+            'KC_MS_UP': 'MS_UP', 'KC_MS_U': 'MS_UP', 'KC_MS_RIGHT': 'MS_RGHT', 'KC_MS_R': 'MS_RGHT',
+            'KC_MS_WH_UP': 'MS_WHLU', 'KC_WH_U': 'MS_WHLU', 'KC_MS_WH_RIGHT': 'MS_WHLR',
+            'KC_WH_R': 'MS_WHLR', 'KC_MS_ACCEL0': 'MS_ACL0', 'KC_ACL2': 'MS_ACL2',
+        }
+        for key_code, name in expected.items():
+            self.assertIsNone(check_keycode(key_code, self.vocabulary), key_code)
+            self.assertEqual(map_keycode(key_code), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Stream and validate VIA layout exports (charybdis.layout.json).
+
+The JSON is read in fixed-size chunks, so only one layer is held in memory at
+a time and macros are checked and counted without being kept. Each keycode is
+checked against a table of QMK keycodes (unwrapping LT(), S(), MT() and the
+like), the VIA names below and the keymap's custom_keycodes, then mapped from
+VIA-only names (CUSTOM(n), RGB_MOD, KC_MS_BTN1, ...) to the names keymap.c
+uses. Errors carry the line and column of the offending value.
+
+Usage:
+    python3 via_ingest.py [charybdis.layout.json]
+"""
+
+import argparse
+import json
+import re
+import os
+import sys
+from json.decoder import scanstring
+
+from keycodes import QMK_KEYCODES
+from keymap_parser import IncrementalKeymap
+
+LAYOUT_PATH = 'charybdis.layout.json'
+KEYMAP_PATH = 'keymap/keymap.c'
+
+VIA_LAYER_SIZE = 60
+# convert_layout.py overrides keys on layers 0-3
+MIN_LAYERS = 4
+MAX_LAYERS = 16
+CHUNK_SIZE = 1 << 16
+
+
+def _legacy_mouse_keycodes():
+    """Long and short legacy mouse keycodes (KC_MS_BTN1/KC_BTN1, ...) -> current MS_ names."""
+    names = {}
+    for n in range(1, 9):
+        names[f"KC_MS_BTN{n}"] = names[f"KC_BTN{n}"] = f"MS_BTN{n}"
+    for n in range(3):
+        names[f"KC_MS_ACCEL{n}"] = names[f"KC_ACL{n}"] = f"MS_ACL{n}"
+    for long, short, name in (("UP", "U", "UP"), ("DOWN", "D", "DOWN"),
+                              ("LEFT", "L", "LEFT"), ("RIGHT", "R", "RGHT")):
+        names[f"KC_MS_{long}"] = names[f"KC_MS_{short}"] = f"MS_{name}"
+        names[f"KC_MS_WH_{long}"] = names[f"KC_WH_{short}"] = f"MS_WHL{short}"
+    return names
+
+
+# VIA-only keycodes -> names used in keymap.c
+VIA_KEYCODE_MAP = {
+    "CUSTOM(0)": "DPI_MOD", "CUSTOM(1)": "DPI_RMOD", "CUSTOM(2)": "S_D_MOD",
+    "CUSTOM(3)": "S_D_RMOD", "CUSTOM(4)": "SNIPING", "CUSTOM(5)": "SNP_TOG",
+    "CUSTOM(6)": "DRGSCRL", "CUSTOM(7)": "DRG_TOG", "RESET": "QK_BOOT",
+    "RGB_TOG": "RM_TOGG", "RGB_MOD": "RM_NEXT", "RGB_RMOD": "RM_PREV",
+    "RGB_HUI": "RM_HUEU", "RGB_HUD": "RM_HUED", "RGB_SAI": "RM_SATU",
+    "RGB_SAD": "RM_SATD", "RGB_VAI": "RM_VALU", "RGB_VAD": "RM_VALD",
+    "RGB_SPI": "RM_SPDU", "RGB_SPD": "RM_SPDD",
+    **_legacy_mouse_keycodes(),
+}
+
+# Wrappers unwrapped to validate the keycodes inside them
+LAYER_FN_RE = re.compile(r'(LT|MO|TG|TO|TT|DF|OSL|PDF)\((\d+)(?:,\s*(.+))?\)$')
+MOD_FN_RE = re.compile(r'(S|C|A|G|LSFT|LCTL|LALT|LGUI|RSFT|RCTL|RALT|RGUI|SGUI|LCA|LSA|LCAG|'
+                       r'MEH|HYPR|C_S|RCS|LSG|LAG|RSG|RAG|LCG|RCG)\((.+)\)$')
+MOD_TAP_RE = re.compile(r'(?:MT\((.+?),\s*(.+)\)|(?:[LR]?(?:SFT|CTL|ALT|GUI|CS|CA|SA|CAG)_T|OSM)\((.+)\))$')
+CUSTOM_RE = re.compile(r'CUSTOM\((\d+)\)$')
+
+MOD_MASKS = frozenset(f'MOD_{side}{mod}' for side in 'LR' for mod in ('CTL', 'SFT', 'ALT', 'GUI')) | {'MOD_MEH', 'MOD_HYPR'}
+# Numbered VIA keycodes (macro slots and user keycodes)
+NUMBERED_KEYCODES = frozenset([f'MACRO({n})' for n in range(32)] + [f'QK_MACRO_{n}' for n in range(32)] +
+                              [f'USER{n:02d}' for n in range(64)])
+
+WHITESPACE_RE = re.compile(r'[ \t\r\n]*')
+SCALAR_RE = re.compile(r'[^,\]}\s]*')
+
+
+class IngestError(Exception):
+    """A problem at a specific location in the export."""
+
+    def __init__(self, message, line, col, path=''):
+        self.message = message
+        self.line = line
+        self.col = col
+        self.path = path
+        super().__init__(f"{path}:{line}:{col}: {message}" if path else f"{line}:{col}: {message}")
+
+
+class JsonStream:
+    """
+    Minimal pull parser over a text file, read in chunks, tracking line/column.
+
+    Whitespace, strings and scalars are scanned with regexes and
+    json.decoder.scanstring over the buffered chunk, so the per-character
+    work stays in C; only one value per call is handled in Python.
+    """
+
+    def __init__(self, f, path='', chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.path = path
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.line = 1
+        self.col = 1
+
+    def error(self, message, line=None, col=None):
+        return IngestError(message, line or self.line, col or self.col, self.path)
+
+    def _extend(self):
+        """Append the next chunk to the unconsumed buffer; False at end of file."""
+        data = self.f.read(self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _advance(self, end):
+        """Consume buf[pos:end], updating line and column."""
+        newlines = self.buf.count('\n', self.pos, end)
+        if newlines:
+            self.line += newlines
+            self.col = end - self.buf.rindex('\n', self.pos, end)
+        else:
+            self.col += end - self.pos
+        self.pos = end
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self._advance(WHITESPACE_RE.match(self.buf, self.pos).end())
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._extend():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise self.error(f"expected {char!r}, found {found!r}" if found else f"expected {char!r}, found end of file")
+        self.pos += 1
+        self.col += 1
+
+    def accept(self, char):
+        if self.peek() == char:
+            self.pos += 1
+            self.col += 1
+            return True
+        return False
+
+    def read_string(self):
+        """Read a JSON string; returns (value, line, col) of its opening quote."""
+        self.expect('"')
+        line, col = self.line, self.col - 1
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos)
+                break
+            except ValueError as e:
+                # Cut off by the chunk boundary (unterminated, or a partial \uXXXX)
+                incomplete = e.msg.startswith('Unterminated') or e.pos >= len(self.buf) - 6
+                if not (incomplete and self._extend()):
+                    raise self.error(f"invalid string: {e.msg}", line, col) from None
+        self._advance(end)
+        return value, line, col
+
+    def read_scalar(self):
+        """Read a number, true, false or null."""
+        self.peek()
+        line, col = self.line, self.col
+        end = SCALAR_RE.match(self.buf, self.pos).end()
+        while end == len(self.buf) and self._extend():
+            end = SCALAR_RE.match(self.buf, self.pos).end()
+        text = self.buf[self.pos:end]
+        self._advance(end)
+        try:
+            return json.loads(text), line, col
+        except ValueError:
+            raise self.error(f"invalid value {text!r}", line, col) from None
+
+    def skip_value(self):
+        """Consume one value of any type without building it."""
+        char = self.peek()
+        if not char:
+            raise self.error("unexpected end of file")
+        if char == '"':
+            self.read_string()
+        elif char in '[{':
+            close = ']' if char == '[' else '}'
+            self.expect(char)
+            if self.accept(close):
+                return
+            while True:
+                if char == '{':
+                    self.read_string()
+                    self.expect(':')
+                self.skip_value()
+                if self.accept(close):
+                    return
+                self.expect(',')
+        else:
+            self.read_scalar()
+
+    def iter_array(self):
+        """Yield once per element of an array; the caller consumes each element."""
+        self.expect('[')
+        if self.accept(']'):
+            return
+        while True:
+            yield
+            if self.accept(']'):
+                return
+            self.expect(',')
+
+    def iter_object(self):
+        """Yield each key of an object; the caller consumes each value."""
+        self.expect('{')
+        if self.accept('}'):
+            return
+        while True:
+            key, _, _ = self.read_string()
+            self.expect(':')
+            yield key
+            if self.accept('}'):
+                return
+            self.expect(',')
+
+
+def keycode_vocabulary(keymap_path=KEYMAP_PATH):
+    """QMK keycodes, VIA names and their mappings, plus the keymap's custom_keycodes."""
+    vocabulary = set(QMK_KEYCODES) | set(VIA_KEYCODE_MAP) | set(VIA_KEYCODE_MAP.values()) | NUMBERED_KEYCODES
+    if keymap_path and os.path.exists(keymap_path):
+        vocabulary.update(IncrementalKeymap.from_file(keymap_path).custom_keycodes)
+    return frozenset(vocabulary)
+
+
+def check_keycode(key_code, vocabulary):
+    """Return an error message for a keycode outside the vocabulary, or None."""
+    if key_code in vocabulary:
+        return None
+    if CUSTOM_RE.match(key_code):
+        return f"no mapping for VIA keycode {key_code}"
+    m = LAYER_FN_RE.match(key_code)
+    if m:
+        if int(m.group(2)) >= MAX_LAYERS:
+            return f"layer {m.group(2)} out of range in {key_code}"
+        return check_keycode(m.group(3).strip(), vocabulary) if m.group(3) else None
+    m = MOD_FN_RE.match(key_code)
+    if m:
+        return check_keycode(m.group(2).strip(), vocabulary)
+    m = MOD_TAP_RE.match(key_code)
+    if m:
+        mods, inner = (m.group(1), m.group(2)) if m.group(1) else (None, m.group(3))
+        if key_code.startswith('OSM('):
+            mods, inner = inner, None
+        for mod in (mods.split('|') if mods else []):
+            if mod.strip() not in MOD_MASKS:
+                return f"unknown modifier {mod.strip()!r} in {key_code}"
+        return check_keycode(inner.strip(), vocabulary) if inner else None
+    return f"unknown keycode {key_code!r}"
+
+
+def map_keycode(key_code):
+    """Map VIA-only names to keymap.c names, including inside LT()/S() wrappers."""
+    if key_code in VIA_KEYCODE_MAP:
+        return VIA_KEYCODE_MAP[key_code]
+    if '(' in key_code:
+        head, _, rest = key_code.partition('(')
+        args = [a.strip() for a in rest[:-1].split(',')]
+        return f"{head}({','.join(VIA_KEYCODE_MAP.get(a, a) for a in args)})"
+    return key_code
+
+
+class LayoutIngest:
+    """Result of ingesting a VIA export: mapped layers plus every error found."""
+
+    def __init__(self):
+        self.name = None
+        self.layers = []
+        self.layer_count = 0
+        self.macro_count = 0
+        self.errors = []
+
+
+def ingest(file_path, layer_size=VIA_LAYER_SIZE, min_layers=MIN_LAYERS, on_layer=None, on_macro=None,
+           chunk_size=CHUNK_SIZE, keep_layers=True, keymap_path=KEYMAP_PATH):
+    """
+    Stream a VIA layout export and validate it as it is read.
+
+    Keycodes are checked against keycode_vocabulary(keymap_path). on_layer(index,
+    keycodes) and on_macro(index, value) are called per item so callers can
+    process exports without keeping them; set keep_layers=False to skip
+    collecting layers on the result. Syntax errors stop the read; content errors
+    are collected on result.errors.
+    """
+    result = LayoutIngest()
+    vocabulary = keycode_vocabulary(keymap_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f, file_path, chunk_size)
+        try:
+            layers_at = None
+            for key in stream.iter_object():
+                if key == 'layers':
+                    stream.peek()
+                    layers_at = (stream.line, stream.col)
+                    _ingest_layers(stream, result, layer_size, vocabulary, on_layer, keep_layers)
+                elif key == 'macros':
+                    _ingest_macros(stream, result, on_macro)
+                elif key == 'name' and stream.peek() == '"':
+                    result.name = stream.read_string()[0]
+                else:
+                    stream.skip_value()
+            if stream.peek():
+                raise stream.error("unexpected data after the top-level object")
+            if result.layer_count < min_layers:
+                line, col = layers_at or (1, 1)
+                result.errors.append(stream.error(
+                    f"{result.layer_count} layers, expected at least {min_layers}", line, col))
+        except IngestError as e:
+            result.errors.append(e)
+    return result
+
+
+def _ingest_layers(stream, result, layer_size, vocabulary, on_layer, keep_layers):
+    for layer_index, _ in enumerate(stream.iter_array()):
+        if layer_index >= MAX_LAYERS:
+            result.errors.append(stream.error(f"more than {MAX_LAYERS} layers"))
+        stream.peek()
+        start_line, start_col = stream.line, stream.col
+        keys = []
+        for pos, _ in enumerate(stream.iter_array()):
+            if stream.peek() != '"':
+                line, col = stream.line, stream.col
+                stream.skip_value()
+                result.errors.append(IngestError(f"layer {layer_index} key {pos}: expected a keycode string",
+                                                 line, col, stream.path))
+                keys.append('KC_NO')
+                continue
+            key_code, line, col = stream.read_string()
+            message = check_keycode(key_code, vocabulary)
+            if message:
+                result.errors.append(IngestError(f"layer {layer_index} key {pos}: {message}",
+                                                 line, col, stream.path))
+            keys.append(map_keycode(key_code))
+        if len(keys) != layer_size:
+            result.errors.append(IngestError(
+                f"layer {layer_index} has {len(keys)} keys, expected {layer_size}",
+                start_line, start_col, stream.path))
+        result.layer_count += 1
+        if on_layer:
+            on_layer(layer_index, keys)
+        if keep_layers:
+            result.layers.append(keys)
+
+
+def _ingest_macros(stream, result, on_macro):
+    for index, _ in enumerate(stream.iter_array()):
+        char = stream.peek()
+        if char == '"':
+            value = stream.read_string()[0]
+        elif char == '[':
+            # Newer VIA exports store macros as action lists; they are skipped unread
+            stream.skip_value()
+            value = None
+        else:
+            line, col = stream.line, stream.col
+            stream.skip_value()
+            result.errors.append(IngestError(f"macro {index}: expected a string or list", line, col,
+                                             stream.path))
+            value = None
+        result.macro_count += 1
+        if on_macro:
+            on_macro(index, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a VIA layout export.")
+    parser.add_argument('layout', nargs='?', default=LAYOUT_PATH)
+    parser.add_argument('--layer-size', type=int, default=VIA_LAYER_SIZE)
+    parser.add_argument('--min-layers', type=int, default=MIN_LAYERS)
+    parser.add_argument('--keymap', default=KEYMAP_PATH, help="keymap.c whose custom_keycodes are accepted")
+    args = parser.parse_args()
+
+    result = ingest(args.layout, args.layer_size, args.min_layers, keep_layers=False,
+                    keymap_path=args.keymap)
+    for error in result.errors:
+        print(error)
+    print(f"{args.layout}: {result.layer_count} layers, {result.macro_count} macros, "
+          f"{len(result.errors)} error(s)")
+    if result.errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()